@@ -2,18 +2,77 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from db import get_async_db
 from models import User
+from schemas import UserRead
 
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 토큰 만료시간 (원하면 변경 가능)
 
+ADMIN_USER_IDS = {int(i) for i in os.getenv("ADMIN_USER_IDS", "").split(",") if i.strip()}  # 예: "1,2"
+
+PRINCIPAL_CACHE_MAXSIZE = 10000
+PRINCIPAL_CACHE_TTL = 300  # 초, 토큰 exp 보다 늦게 만료되지는 않음
+
 security = HTTPBearer()
 
+
+# 🔹 토큰 → 검증된 유저 정보 캐시
+# 같은 토큰이 반복해서 들어오면 jwt.decode + User 조회를 건너뜀
+class PrincipalCache:
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_MAXSIZE, ttl: float = PRINCIPAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (만료시각, UserRead)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserRead]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+
+    def set(self, token: str, principal: UserRead, exp: float):
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (min(exp, time.time() + self.ttl), principal)
+            self._tokens_by_user.setdefault(principal.user_id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def evict_user(self, user_id: int):
+        # 프로필 수정 / 비밀번호 변경 / 탈퇴 시 호출
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def _remove(self, token: str):
+        _, principal = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.user_id]
+
+
+principal_cache = PrincipalCache()
+
 # 🔹 토큰 생성 함수
 def create_access_token(data: dict, expires_delta: int = ACCESS_TOKEN_EXPIRE_MINUTES):
     to_encode = data.copy()
@@ -23,13 +82,32 @@ def create_access_token(data: dict, expires_delta: int = ACCESS_TOKEN_EXPIRE_MIN
     return encoded_jwt
 
 
+# 🔹 토큰에서 user_id 만 꺼내기 (레플리카 라우팅 / rate limit 키 용도)
+# 검증 실패해도 에러를 내지 않음 (인증은 get_current_user 가 담당)
+def peek_user_id(token: Optional[str]) -> Optional[int]:
+    if not token:
+        return None
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal.user_id
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("user_id")
+
+
 # 🔹 토큰 검증 함수
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     token = credentials.credentials
 
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("user_id")
@@ -38,8 +116,22 @@ def get_current_user(
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="틀린 토큰입니다.")
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
 
-    return user
+    principal = UserRead(
+        user_id=user.user_id,
+        email=user.email,
+        nickname=user.nickname,
+        profile_image=user.profile_image,
+    )
+    principal_cache.set(token, principal, exp=payload["exp"])
+    return principal
+
+
+# 🔹 관리자 확인 (ADMIN_USER_IDS 에 있는 유저만 통과)
+async def get_admin_user(current_user = Depends(get_current_user)):
+    if current_user.user_id not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="forbidden")
+    return current_user
@@ -0,0 +1,107 @@
+# bench_auth.py
+# 인증 의존성(get_current_user) 비용: principal_cache 사용 vs 미사용
+# - GET /bench/me 하나만 있는 작은 앱 (Depends(get_current_user) 만 실행하고 유저 정보를 반환)
+# - --users 명의 토큰을 돌려 쓰면서 동시 클라이언트 --concurrency 개로 closed-loop 실행
+# - cached  : 평소 설정 (토큰이 캐시에 있으면 jwt.decode + User 조회를 건너뜀)
+#   uncached: principal_cache.maxsize = 0 → 넣자마자 빠져서 매 요청 jwt.decode + SELECT users
+# - 처리량, p50/p95/p99, 요청당 SQL 수 출력
+#
+# 실행 (임시 폴더의 app.db 에 벤치용 유저를 만들어 사용): python bench_auth.py --duration 10
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+START_DIR = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="bench-auth-"))  # db.py 는 ./app.db 사용 → 실제 DB 를 건드리지 않도록
+
+os.environ.setdefault("SLOW_QUERY_MS", "60000")  # 측정 중 느린 쿼리 로그(EXPLAIN) 끔
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+from auth import create_access_token, get_current_user, principal_cache  # noqa: E402
+from db import SessionLocal, async_engine  # noqa: E402
+from loadtest import closed_loop  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+from models import User  # noqa: E402
+from responses import FastJSONResponse  # noqa: E402
+
+app = FastAPI(default_response_class=FastJSONResponse)
+
+
+@app.get("/bench/me")
+async def me(current_user = Depends(get_current_user)):
+    return {"message": "get_profile_success", "data": {"user_id": current_user.user_id}}
+
+
+def bench_user_ids(users: int) -> list:
+    run_migrations()
+    with SessionLocal() as db:
+        emails = [f"bench-auth{i}@example.com" for i in range(users)]
+        existing = set(db.scalars(select(User.email).where(User.email.in_(emails))))
+        db.add_all(User(email=e, password="-", nickname=e.split("@")[0]) for e in emails if e not in existing)
+        db.commit()
+        return list(db.scalars(select(User.user_id).where(User.email.in_(emails))))
+
+
+async def bench(client: httpx.AsyncClient, headers: list, concurrency: int, duration: float) -> dict:
+    statements = 0
+
+    def before_cursor_execute(*args):
+        nonlocal statements
+        statements += 1
+
+    async def call(recorder):
+        started = time.perf_counter()
+        response = await client.get("/bench/me", headers=random.choice(headers))
+        recorder.add("GET /bench/me", started, response.status_code)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        report = await closed_loop(concurrency, duration, call)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    r = report["routes"]["GET /bench/me"]
+    r["sql_per_request"] = statements / r["count"] if r["count"] else 0.0
+    return r
+
+
+async def main(args):
+    headers = [
+        {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+        for user_id in bench_user_ids(args.users)
+    ]
+    maxsize = principal_cache.maxsize
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, size in (("uncached", 0), ("cached", maxsize)):
+            principal_cache.maxsize = size
+            for h in headers:  # 워밍업 (cached 는 여기서 캐시가 채워짐)
+                await client.get("/bench/me", headers=h)
+            r = results[name] = await bench(client, headers, args.concurrency, args.duration)
+            print(
+                f"{name:8} {r['throughput_rps']:8.1f} req/s  p50 {r['p50_ms']:6.2f}  p95 {r['p95_ms']:6.2f}  "
+                f"p99 {r['p99_ms']:6.2f} ms  SQL/req {r['sql_per_request']:.2f}  err {r['errors']}"
+            )
+    principal_cache.maxsize = maxsize
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인증 캐시 사용 / 미사용 비교")
+    parser.add_argument("--users", type=int, default=100, help="토큰을 만들 유저 수")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10, help="방식별 측정 시간 (초)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.join(START_DIR, args.out)
+    asyncio.run(main(args))
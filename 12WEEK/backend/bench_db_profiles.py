@@ -0,0 +1,134 @@
+# bench_db_profiles.py
+# DB_PROFILE=production (WAL 등) vs dev (SQLite 기본값) 에서 같은 읽기/쓰기 혼합 부하의 처리량 비교
+# - DB_PROFILE 은 db.py import 시점에 정해지므로 프로필마다 새 프로세스 + 새 임시 폴더(app.db)에서 실행
+# - 컨트롤러를 직접 호출 (HTTP 계층 없이 DB 설정 차이만 보이도록)
+#   피드 / 상세 / 좋아요 / 댓글을 --mix 비율로, 동시 작업자 --concurrency 개가 --duration 초 동안 closed-loop
+# - 프로필별 처리량(req/s), 작업별 p50/p95/p99, 에러 수 (dev 는 busy_timeout 이 없어 database is locked 가 날 수 있음)
+#
+# 실행: python bench_db_profiles.py --duration 20 --concurrency 50
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_MIX = "feed=50,detail=30,like=10,comment=10"
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, weight = part.split("=")
+        if name not in ("feed", "detail", "like", "comment"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 작업: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+async def run_worker(args) -> dict:
+    # 여기서부터는 DB_PROFILE 이 정해진 자식 프로세스 (cwd = 임시 폴더)
+    from controllers import (
+        CreateCommentRequest, create_comment_controller, list_posts_controller, post_detail_controller,
+        toggle_like_controller,
+    )
+    from db import AsyncSessionLocal, SessionLocal
+    from loadtest import closed_loop
+    from migrations import run_migrations
+    from models import Comment, Post, User
+
+    run_migrations()
+    with SessionLocal() as db:
+        users = [User(email=f"bench{i}@example.com", password="-", nickname=f"bench{i}") for i in range(args.users)]
+        db.add_all(users)
+        db.flush()
+        posts = [Post(user_id=users[i % args.users].user_id, title=f"bench {i}", content="벤치마크") for i in range(args.posts)]
+        db.add_all(posts)
+        db.flush()
+        db.add_all(Comment(post_id=p.post_id, user_id=p.user_id, content="댓글") for p in posts for _ in range(5))
+        db.commit()
+        user_ids = [u.user_id for u in users]
+        post_ids = [p.post_id for p in posts]
+
+    async def feed(db):
+        await list_posts_controller(db, None, 10)
+
+    async def detail(db):
+        await post_detail_controller(db, random.choice(post_ids))
+
+    async def like(db):
+        await toggle_like_controller(db, random.choice(post_ids), random.random() < 0.7, random.choice(user_ids))
+
+    async def comment(db):
+        body = CreateCommentRequest(content="벤치마크 댓글")
+        await create_comment_controller(db, random.choice(post_ids), body, random.choice(user_ids))
+
+    mix = parse_mix(args.mix)
+    ops = {"feed": feed, "detail": detail, "like": like, "comment": comment}
+    names, weights = list(mix), list(mix.values())
+
+    async def call(recorder):
+        name = random.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                await ops[name](db)
+        except Exception as e:
+            recorder.add(name, started, type(e).__name__)
+            return
+        recorder.add(name, started, 200)
+
+    return await closed_loop(args.concurrency, args.duration, call)
+
+
+def run_profile(profile: str, args) -> dict:
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--worker",
+        "--duration", str(args.duration), "--concurrency", str(args.concurrency),
+        "--users", str(args.users), "--posts", str(args.posts), "--mix", args.mix,
+    ]
+    env = dict(os.environ, DB_PROFILE=profile, SLOW_QUERY_MS=os.getenv("SLOW_QUERY_MS", "60000"))
+    with tempfile.TemporaryDirectory(prefix=f"bench-{profile}-") as tmp:
+        out = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"{profile} 실행 실패:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(args):
+    results = {}
+    for profile in args.profiles:
+        report = results[profile] = run_profile(profile, args)
+        print(f"[{profile}] {report['throughput_rps']:.1f} req/s ({report['total_requests']} requests)")
+        for name, r in report["routes"].items():
+            print(
+                f"  {name:8} {r['count']:7d} err {r['errors']:5d}  "
+                f"p50 {r['p50_ms']:7.1f}  p95 {r['p95_ms']:7.1f}  p99 {r['p99_ms']:7.1f} ms  {r['status']}"
+            )
+    if len(results) == 2:
+        a, b = (results[p]["throughput_rps"] for p in args.profiles)
+        if b:
+            print(f"{args.profiles[0]} / {args.profiles[1]} 처리량: {a / b:.2f}x")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB_PROFILE 별 읽기/쓰기 혼합 부하 처리량 비교")
+    parser.add_argument("--profiles", type=lambda s: s.split(","), default=["production", "dev"])
+    parser.add_argument("--duration", type=float, default=20, help="프로필별 측정 시간 (초)")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 작업자 수")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="작업 비율 (예: feed=50,detail=30,like=10,comment=10)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args))))
+    else:
+        main(args)
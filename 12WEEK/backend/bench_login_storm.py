@@ -0,0 +1,96 @@
+# bench_login_storm.py
+# 로그인 폭주 중에도 GET /posts 지연이 유지되는지 확인
+# - 1단계 (기준): 피드 조회만 --rate 로 open-loop 실행 (loadtest.py 의 LoadTest 재사용)
+# - 2단계 (폭주): 같은 피드 부하 + 로그인 클라이언트 --login-concurrency 개가 쉬지 않고 /users/login
+#   → scrypt 해시가 이벤트 루프를 막으면 피드 p95/p99 가 크게 뛰어오름 (passwords.py 가 전용 스레드풀에서 계산)
+# - 두 단계의 GET /posts p50/p95/p99 와 로그인 처리량 출력,
+#   p95/p99 가 --tolerance 이상 나빠지면 종료 코드 1
+#
+# 서버는 rate limit 을 끄고 실행:  RATE_LIMIT_ENABLED=0 uvicorn main:app
+#   python bench_login_storm.py --base-url http://localhost:8000
+# --base-url 없이 실행하면 main.app 을 프로세스 안에서 실행 (httpx.ASGITransport)
+#   이때는 임시 폴더의 app.db 를 사용 (backend/app.db 는 건드리지 않음)
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+
+import httpx
+
+from loadtest import USER_PASSWORD, LoadTest, Recorder, compare, print_report
+
+
+async def login_storm(test: LoadTest, concurrency: int, stop: asyncio.Event):
+    async def worker():
+        while not stop.is_set():
+            i = random.randrange(test.users)
+            await test.request(
+                "POST /users/login", "POST", "/users/login",
+                json={"email": f"loadtest{i}@example.com", "password": USER_PASSWORD},
+            )
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+
+async def main(args) -> int:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+        # main import 시 마이그레이션, setup() 에서 회원가입 → db.py 의 ./app.db 가 임시 폴더에 생기도록
+        os.chdir(tempfile.mkdtemp(prefix="bench-login-storm-"))
+        from main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        test = LoadTest(client, Recorder(), args.users)
+        await test.setup(posts_per_user=1)
+
+        test.recorder = Recorder()
+        baseline = test.recorder.report(await test.run(args.rate, args.duration, {"feed": 1}))
+
+        test.recorder = Recorder()
+        stop = asyncio.Event()
+        storm = asyncio.create_task(login_storm(test, args.login_concurrency, stop))
+        elapsed = await test.run(args.rate, args.duration, {"feed": 1})
+        stop.set()
+        await storm
+        during = test.recorder.report(elapsed)
+
+    print("[기준: 피드만]")
+    print_report(baseline)
+    print(f"[로그인 폭주: 로그인 클라이언트 {args.login_concurrency}개]")
+    print_report(during)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"baseline": baseline, "login_storm": during}, f, ensure_ascii=False, indent=2)
+
+    regressions = compare(during, baseline, args.tolerance)
+    if regressions:
+        print("로그인 폭주 중 피드 지연 증가:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print("로그인 폭주 중에도 피드 지연 유지")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 피드 지연 확인")
+    parser.add_argument("--base-url", default=None, help="없으면 main.app 을 프로세스 안에서 실행")
+    parser.add_argument("--rate", type=float, default=20, help="피드 요청 초당 도착 수")
+    parser.add_argument("--duration", type=float, default=20, help="단계별 시간 (초)")
+    parser.add_argument("--users", type=int, default=20, help="로그인할 유저 수")
+    parser.add_argument("--login-concurrency", type=int, default=50, help="동시에 로그인하는 클라이언트 수")
+    parser.add_argument("--connections", type=int, default=200, help="최대 동시 연결 수")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용하는 피드 p95/p99 증가 비율")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.abspath(args.out)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,130 @@
+# bench_media.py
+# /media 재방문 비용: 전송 바이트 / 요청 수 / CPU
+# - 임시 폴더에 내용 해시 이름 이미지(업로드 원본, 썸네일)와 예전 이름(uuid) 이미지를 만들고 세 가지로 서빙
+#   - no_cache: 브라우저 캐시 없음 (매번 전체 다운로드)
+#   - static  : 예전 방식 StaticFiles (Cache-Control 없음 → 브라우저가 ETag / Last-Modified 로 매번 재검증)
+#   - media   : 지금 방식 MediaFiles (해시 이름은 immutable → 재방문 때 요청 자체가 없음, 나머지는 304)
+# - 같은 페이지의 이미지를 --visits 번 방문, 첫 방문 이후(재방문)의 요청 수 / 바이트 / 상태 코드 / CPU 시간 출력
+#   (프로세스 안에서 httpx.ASGITransport 로 실행하므로 CPU 시간에는 클라이언트 쪽도 포함)
+#
+# 실행: python bench_media.py --files 40 --legacy 10 --size 200000 --visits 5
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from media import MediaFiles
+
+
+class BrowserCache:
+    # 아주 단순한 브라우저 캐시: immutable / max-age 가 있으면 재사용, 아니면 조건부 요청으로 재검증
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.entries = {}  # url -> 응답 헤더
+
+    async def get(self, client: httpx.AsyncClient, url: str, stats: dict):
+        entry = self.entries.get(url) if self.enabled else None
+        if entry is not None:
+            cache_control = entry.get("cache-control", "")
+            if "immutable" in cache_control or ("max-age" in cache_control and "no-cache" not in cache_control):
+                stats["from_cache"] += 1
+                return
+        headers = {}
+        if entry is not None:
+            if "etag" in entry:
+                headers["if-none-match"] = entry["etag"]
+            if "last-modified" in entry:
+                headers["if-modified-since"] = entry["last-modified"]
+        response = await client.get(url, headers=headers)
+        stats["requests"] += 1
+        stats["bytes"] += len(response.content)
+        stats["status"][response.status_code] += 1
+        if response.status_code == 200:
+            self.entries[url] = response.headers
+
+
+def make_files(root: Path, files: int, legacy: int, size: int) -> list:
+    urls = []
+    for folder in ("post_images", "variants", "profile"):
+        (root / folder).mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        data = os.urandom(size)
+        name = f"{hashlib.sha256(data).hexdigest()}.jpg"
+        # 절반은 원본, 절반은 썸네일(작은 파일)
+        folder, body = ("post_images", data) if i % 2 == 0 else ("variants", data[: size // 8])
+        (root / folder / name).write_bytes(body)
+        urls.append(f"/media/{folder}/{name}")
+    for _ in range(legacy):
+        name = f"{uuid.uuid4().hex}.jpg"
+        (root / "profile" / name).write_bytes(os.urandom(size // 4))
+        urls.append(f"/media/profile/{name}")
+    return urls
+
+
+async def visit(app, urls: list, visits: int, cache_enabled: bool) -> dict:
+    cache = BrowserCache(enabled=cache_enabled)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = {"requests": 0, "bytes": 0, "from_cache": 0, "status": Counter()}
+        for url in urls:
+            await cache.get(client, url, first)
+
+        repeat = {"requests": 0, "bytes": 0, "from_cache": 0, "status": Counter()}
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for _ in range(visits - 1):
+            for url in urls:
+                await cache.get(client, url, repeat)
+        repeat["cpu_ms"] = (time.process_time() - cpu_started) * 1000
+        repeat["wall_ms"] = (time.perf_counter() - wall_started) * 1000
+    for stats in (first, repeat):
+        stats["status"] = dict(stats["status"])
+    return {"first_visit": first, "repeat_visits": repeat}
+
+
+def main(args):
+    with tempfile.TemporaryDirectory(prefix="bench-media-") as tmp:
+        run(Path(tmp), args)
+
+
+def run(root: Path, args):
+    urls = make_files(root, args.files, args.legacy, args.size)
+    apps = {
+        "no_cache": (Starlette(routes=[Mount("/media", StaticFiles(directory=root))]), False),
+        "static": (Starlette(routes=[Mount("/media", StaticFiles(directory=root))]), True),
+        "media": (Starlette(routes=[Mount("/media", MediaFiles(directory=root))]), True),
+    }
+
+    results = {}
+    print(f"이미지 {len(urls)}개 (해시 이름 {args.files}, 예전 이름 {args.legacy}), 방문 {args.visits}번")
+    print(f"{'variant':9} {'재방문 요청':>10} {'캐시 사용':>9} {'전송 바이트':>13} {'CPU ms':>8} {'wall ms':>8}  상태")
+    for name, (app, cache_enabled) in apps.items():
+        r = results[name] = asyncio.run(visit(app, urls, args.visits, cache_enabled))
+        repeat = r["repeat_visits"]
+        print(
+            f"{name:9} {repeat['requests']:10d} {repeat['from_cache']:9d} {repeat['bytes']:13d} "
+            f"{repeat['cpu_ms']:8.1f} {repeat['wall_ms']:8.1f}  {repeat['status']}"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/media 재방문 전송량 / CPU 비교")
+    parser.add_argument("--files", type=int, default=40, help="내용 해시 이름 이미지 수")
+    parser.add_argument("--legacy", type=int, default=10, help="예전(uuid) 이름 이미지 수")
+    parser.add_argument("--size", type=int, default=200_000, help="원본 이미지 크기 (바이트)")
+    parser.add_argument("--visits", type=int, default=5, help="방문 횟수 (첫 방문 포함)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    main(parser.parse_args())
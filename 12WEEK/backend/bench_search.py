@@ -0,0 +1,151 @@
+# bench_search.py
+# 게시글 검색(FTS5) 지연 측정 - 기본 게시글 100만 개
+# - --dir 폴더의 app.db 에 게시글이 --posts 개보다 적으면 채움 (한 번 만들어두면 다음 실행부터 재사용)
+#   단어는 한글 음절로 만든 어휘에서 Zipf 분포로 뽑음 → 아주 흔한 단어 ~ 드문 단어가 섞인 실제와 비슷한 분포
+# - search_posts_controller 를 직접 호출해서 검색어 종류(흔함 / 중간 / 드묾 / 두 단어 / 접두)별로
+#   첫 페이지, 다음 페이지(커서)의 p50/p95/p99 측정
+# - 비교용으로 FTS 도입 전 방식(LIKE '%단어%')도 몇 번 실행
+#
+# 실행: python bench_search.py --posts 1000000 --repeat 50
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+DEFAULT_DIR = os.path.join(tempfile.gettempdir(), "ktb-bench-search")
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+VOCAB_SIZE = 20000
+INSERT_BATCH = 10000
+
+
+def make_vocab(rng: random.Random) -> list:
+    vocab = set()
+    while len(vocab) < VOCAB_SIZE:
+        vocab.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(vocab, key=lambda w: rng.random())
+
+
+def seed(posts: int, vocab: list, rng: random.Random):
+    from sqlalchemy import func, select
+
+    from db import SessionLocal, engine
+    from migrations import run_migrations
+    from models import Post, User
+
+    run_migrations()
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).select_from(Post))
+        user = db.scalar(select(User).where(User.email == "bench-search@example.com"))
+        if user is None:
+            user = User(email="bench-search@example.com", password="-", nickname="bench")
+            db.add(user)
+            db.commit()
+        user_id = user.user_id
+    if existing >= posts:
+        return
+
+    # Zipf: i 번째 단어의 빈도 ∝ 1 / (i + 1)
+    cum_weights = []
+    total = 0.0
+    for i in range(len(vocab)):
+        total += 1 / (i + 1)
+        cum_weights.append(total)
+
+    def words(n: int) -> str:
+        return " ".join(rng.choices(vocab, cum_weights=cum_weights, k=n))
+
+    print(f"게시글 {posts - existing}개 생성 중 (FTS 트리거로 색인도 같이 만들어짐)...")
+    started = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(existing, posts, INSERT_BATCH):
+            rows = [(user_id, words(5), words(40), 0, 0) for _ in range(min(INSERT_BATCH, posts - start))]
+            cursor.executemany(
+                "INSERT INTO posts (user_id, title, content, like_count, view_count) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            raw.commit()
+            print(f"  {start + len(rows)} / {posts}", end="\r")
+        cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('optimize')")
+        raw.commit()
+    finally:
+        raw.close()
+    print(f"\n생성 완료: {time.perf_counter() - started:.1f}s")
+
+
+async def run(args, vocab: list) -> dict:
+    from sqlalchemy import text
+
+    from controllers import search_posts_controller
+    from db import AsyncSessionLocal
+    from loadtest import Recorder
+
+    queries = {
+        "common": vocab[0],
+        "mid": vocab[100],
+        "rare": vocab[5000],
+        "two_terms": f"{vocab[0]} {vocab[50]}",
+        "prefix": vocab[10][:1],
+    }
+    recorder = Recorder()
+    started_all = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for name, q in queries.items():
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                first = await search_posts_controller(db, q, None, args.limit)
+                recorder.add(f"fts {name} page1", started, 200)
+                cursor = first["data"]["next_cursor"]
+                if cursor:
+                    started = time.perf_counter()
+                    await search_posts_controller(db, q, cursor, args.limit)
+                    recorder.add(f"fts {name} page2", started, 200)
+
+        # FTS 도입 전 방식: 인덱스를 못 타서 매번 테이블 전체를 읽음
+        like_sql = text(
+            "SELECT post_id FROM posts WHERE title LIKE :p OR content LIKE :p ORDER BY post_id DESC LIMIT :limit"
+        )
+        for name in ("common", "rare"):
+            for _ in range(args.like_repeat):
+                started = time.perf_counter()
+                await db.execute(like_sql, {"p": f"%{queries[name]}%", "limit": args.limit})
+                recorder.add(f"like {name} page1", started, 200)
+    return recorder.report(time.perf_counter() - started_all)
+
+
+def main(args):
+    os.makedirs(args.dir, exist_ok=True)
+    os.chdir(args.dir)  # db.py 는 현재 폴더의 ./app.db 를 사용 → import 전에 이동
+    os.environ.setdefault("SLOW_QUERY_MS", "60000")  # LIKE 비교가 느린 쿼리 로그로 도배되지 않도록
+
+    rng = random.Random(args.seed)
+    vocab = make_vocab(rng)
+    seed(args.posts, vocab, rng)
+    report = asyncio.run(run(args, vocab))
+
+    print(f"게시글 {args.posts}개, limit {args.limit}")
+    print(f"{'query':22} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} (ms)")
+    for name, r in report["routes"].items():
+        print(f"{name:22} {r['count']:6d} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f} {r['max_ms']:9.2f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 검색 지연 측정")
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="벤치마크용 app.db 를 둘 폴더 (재사용)")
+    parser.add_argument("--repeat", type=int, default=50, help="검색어별 반복 횟수")
+    parser.add_argument("--like-repeat", type=int, default=3, help="LIKE 비교 반복 횟수 (0 이면 생략)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (같으면 같은 데이터 / 검색어)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.abspath(args.out)
+    main(args)
@@ -0,0 +1,118 @@
+# bench_serialization.py
+# 엔드포인트별 응답 직렬화 비용: FastAPI 기본 경로 vs FastJSONResponse (responses.py)
+# - 임시 폴더의 app.db 에 게시글 / 댓글을 만들고, 실제 컨트롤러가 돌려주는 dict 를 그대로 사용
+#   피드(10개 / 50개) / 상세(댓글 첫 페이지) / 프로필 / 검색 / 일괄 조회
+# - default: response_model 이 있으면 검증 + JSON 모드 dump, 없으면 jsonable_encoder → JSONResponse(표준 json)
+#   (FastAPI 가 dict 를 반환하는 라우트에서 하는 일)
+#   fast   : FastJSONResponse(dict) (orjson 이 있으면 orjson, 검증 / jsonable_encoder 없음)
+# - 한 번당 µs, 응답 크기, 배율 출력
+#
+# 실행: python bench_serialization.py --number 2000
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import timeit
+
+START_DIR = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="bench-serialization-"))  # db.py 는 ./app.db 사용 → 실제 DB 를 건드리지 않도록
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from controllers import (  # noqa: E402
+    batch_posts_controller, get_profile_controller, list_posts_controller, post_detail_controller,
+    search_posts_controller,
+)
+from db import AsyncSessionLocal, SessionLocal  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+from models import Comment, Post, User  # noqa: E402
+from responses import FastJSONResponse, orjson  # noqa: E402
+from schemas import PostDetailResponse, PostListResponse, UserProfileResponse  # noqa: E402
+
+
+def seed(posts: int, comments: int) -> tuple:
+    run_migrations()
+    with SessionLocal() as db:
+        users = [User(email=f"bench{i}@example.com", password="-", nickname=f"과일{i}") for i in range(20)]
+        db.add_all(users)
+        db.flush()
+        rows = [
+            Post(
+                user_id=users[i % 20].user_id,
+                title=f"오늘의 과일 {i}",
+                content="사과 배 귤 포도 " * 20,
+                image=f"/media/post_images/{i:064x}.jpg",
+                like_count=i,
+                view_count=i * 3,
+            )
+            for i in range(posts)
+        ]
+        db.add_all(rows)
+        db.flush()
+        db.add_all(
+            Comment(post_id=rows[0].post_id, user_id=users[i % 20].user_id, content=f"맛있어 보여요 {i}")
+            for i in range(comments)
+        )
+        db.commit()
+        return users[0].user_id, rows[0].post_id, [p.post_id for p in rows[:50]]
+
+
+async def payloads(user_id: int, post_id: int, post_ids: list) -> dict:
+    async with AsyncSessionLocal() as db:
+        return {
+            "GET /posts?limit=10": (await list_posts_controller(db, None, 10), TypeAdapter(PostListResponse)),
+            "GET /posts?limit=50": (await list_posts_controller(db, None, 50), TypeAdapter(PostListResponse)),
+            "GET /posts/{post_id}": (await post_detail_controller(db, post_id), TypeAdapter(PostDetailResponse)),
+            "GET /users/me": (await get_profile_controller(db, user_id), TypeAdapter(UserProfileResponse)),
+            "GET /posts/search": (await search_posts_controller(db, "과일", None, 20), None),
+            "GET /posts:batch": (await batch_posts_controller(db, post_ids), None),
+        }
+
+
+def default_path(payload: dict, adapter):
+    # adapter 는 라우트 등록 시 한 번 만들어지는 response_model 검증기에 해당
+    if adapter is not None:
+        content = adapter.dump_python(adapter.validate_python(payload), mode="json")
+    else:
+        content = jsonable_encoder(payload)
+    return JSONResponse(content).body
+
+
+def fast_path(payload: dict, adapter):
+    return FastJSONResponse(payload).body
+
+
+def main(args):
+    user_id, post_id, post_ids = seed(args.posts, args.comments)
+    cases = asyncio.run(payloads(user_id, post_id, post_ids))
+
+    results = {}
+    print(f"orjson: {'사용' if orjson is not None else '없음 (표준 json)'}")
+    print(f"{'endpoint':24} {'bytes':>7} {'default µs':>11} {'fast µs':>9} {'배율':>6}")
+    for name, (payload, adapter) in cases.items():
+        row = {"bytes": len(fast_path(payload, adapter))}
+        for label, fn in (("default", default_path), ("fast", fast_path)):
+            seconds = min(timeit.repeat(lambda: fn(payload, adapter), number=args.number, repeat=args.repeat))
+            row[f"{label}_us"] = seconds / args.number * 1e6
+        row["speedup"] = row["default_us"] / row["fast_us"]
+        results[name] = row
+        print(f"{name:24} {row['bytes']:7d} {row['default_us']:11.1f} {row['fast_us']:9.1f} {row['speedup']:5.1f}x")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엔드포인트별 응답 직렬화 비용 비교")
+    parser.add_argument("--number", type=int, default=2000, help="측정 한 번에 반복할 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--comments", type=int, default=50, help="상세 조회할 게시글의 댓글 수")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.join(START_DIR, args.out)
+    main(args)
@@ -0,0 +1,143 @@
+# bench_sync_async.py
+# 동기(def + SessionLocal) vs 비동기(async def + AsyncSessionLocal) 라우트 처리량 비교
+# - 같은 피드 쿼리(게시글 + 작성자 조인, 최신순 limit)를 두 방식으로 실행하는 라우트만 가진 작은 앱
+#   - GET /bench/sync/posts : 예전 방식. def 라우트 + get_db → 요청마다 스레드풀 슬롯을 잡고 DB 대기
+#   - GET /bench/async/posts: 지금 방식. async def 라우트 + get_async_db → 이벤트 루프에서 DB 대기
+# - 동시 클라이언트 50 / 200 / 1000 (--concurrency) 으로 closed-loop 실행 후 처리량과 p50/p95/p99 출력
+#
+# 실행 (임시 폴더의 app.db 에 게시글 --seed 개를 채워서 사용, backend/app.db 는 건드리지 않음):
+#   python bench_sync_async.py                                  # 프로세스 안에서 (httpx.ASGITransport)
+#   uvicorn bench_sync_async:app --port 8001                    # 실제 서버로 재려면 띄운 뒤 (시작할 때 BENCH_SEED 개 채움)
+#   python bench_sync_async.py --base-url http://localhost:8001
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+START_DIR = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="bench-sync-async-"))  # db.py 는 ./app.db 사용 → 실제 DB 를 건드리지 않도록
+
+# 동시성이 높으면 커넥션 대기 때문에 모든 쿼리가 느린 쿼리로 잡혀서 EXPLAIN 까지 돌게 됨 → 측정 중에는 끔
+os.environ.setdefault("SLOW_QUERY_MS", "60000")
+BENCH_SEED = int(os.getenv("BENCH_SEED", "200"))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from db import SessionLocal, get_async_db, get_db  # noqa: E402
+from loadtest import closed_loop  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+from models import Post, User  # noqa: E402
+from responses import FastJSONResponse  # noqa: E402
+
+app = FastAPI(default_response_class=FastJSONResponse)
+
+
+@app.on_event("startup")
+def seed_on_startup():
+    # uvicorn 으로 띄운 경우 (이 프로세스의 임시 app.db 를 채움)
+    seed(BENCH_SEED)
+
+
+def _feed_query(limit: int):
+    return (
+        select(Post, User)
+        .join(User, Post.user_id == User.user_id)
+        .order_by(Post.post_id.desc())
+        .limit(limit)
+    )
+
+
+def _feed_data(rows) -> list:
+    return [
+        {"post_id": post.post_id, "user_nickname": user.nickname, "title": post.title, "like_count": post.like_count}
+        for post, user in rows
+    ]
+
+
+@app.get("/bench/sync/posts")
+def sync_posts(limit: int = 20, db: Session = Depends(get_db)):
+    rows = db.execute(_feed_query(limit)).all()
+    return {"message": "list_posts_success", "data": _feed_data(rows)}
+
+
+@app.get("/bench/async/posts")
+async def async_posts(limit: int = 20, db: AsyncSession = Depends(get_async_db)):
+    rows = (await db.execute(_feed_query(limit))).all()
+    return {"message": "list_posts_success", "data": _feed_data(rows)}
+
+
+def seed(posts: int):
+    run_migrations()
+    with SessionLocal() as db:
+        missing = posts - db.scalar(select(func.count()).select_from(Post))
+        if missing <= 0:
+            return
+        user = db.scalar(select(User).where(User.email == "bench@example.com"))
+        if user is None:
+            user = User(email="bench@example.com", password="-", nickname="bench")
+            db.add(user)
+            db.flush()
+        db.add_all(Post(user_id=user.user_id, title=f"bench {n}", content="벤치마크용 게시글") for n in range(missing))
+        db.commit()
+
+
+async def bench(client: httpx.AsyncClient, variant: str, concurrency: int, duration: float) -> dict:
+    url = f"/bench/{variant}/posts"
+
+    async def call(recorder):
+        started = time.perf_counter()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as e:
+            recorder.add(variant, started, type(e).__name__)
+            return
+        recorder.add(variant, started, response.status_code)
+
+    return (await closed_loop(concurrency, duration, call))["routes"][variant]
+
+
+async def main(args):
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    results = {}
+    for concurrency in args.concurrency:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            for variant in ("sync", "async"):
+                await client.get(f"/bench/{variant}/posts")  # 워밍업 (커넥션 풀, 스레드)
+                r = await bench(client, variant, concurrency, args.duration)
+                results[f"{variant}@{concurrency}"] = r
+                print(
+                    f"{variant:5} c={concurrency:<5} {r['throughput_rps']:8.1f} req/s  "
+                    f"p50 {r['p50_ms']:7.1f}  p95 {r['p95_ms']:7.1f}  p99 {r['p99_ms']:7.1f} ms  err {r['errors']}"
+                )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기 vs 비동기 라우트 처리량 비교")
+    parser.add_argument("--base-url", default=None, help="없으면 프로세스 안에서 실행")
+    parser.add_argument("--concurrency", type=lambda s: [int(n) for n in s.split(",")], default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10, help="동시성 / 방식별 측정 시간 (초)")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED, help="프로세스 안에서 실행할 때 채울 게시글 수")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.join(START_DIR, args.out)
+    if not args.base_url:
+        seed(args.seed)
+    asyncio.run(main(args))
@@ -0,0 +1,126 @@
+# cache.py
+# 피드 첫 페이지 / 인기 게시글 상세 응답 캐시 (LRU + TTL)
+# - 키: 라우트 + 파라미터, 값: 직렬화된 JSON 바이트
+# - 각 항목에 태그(feed, post:{id}, user:{id})를 붙여두고, 쓰기가 일어나면 해당 태그만 무효화
+# - 읽기 전에 version() 을 받아두고 set(..., since=version) 으로 넣으면,
+#   읽는 도중에 태그가 무효화된 경우(느린 읽기 + 그 사이 커밋된 쓰기) 옛날 응답을 넣지 않음
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"  # 벤치마크 때 0 으로 끄기
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "10"))  # 초
+
+FEED_TAG = "feed"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_MAXSIZE,
+        ttl: float = RESPONSE_CACHE_TTL,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (만료시각, body, tags)
+        self._tags: Dict[str, Set[str]] = {}                     # tag -> keys
+        self._version = 0                                        # invalidate 할 때마다 +1
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()  # tag -> 마지막 무효화 version (오래된 순)
+        self._floor = 0                                          # _invalidated 에서 버린 version 중 최댓값
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def set(self, key: str, body: bytes, tags: Iterable[str], since: Optional[int] = None):
+        # since: 읽기 전에 받아둔 version(), 그 뒤로 tags 중 하나라도 무효화됐으면 넣지 않음
+        if not self.enabled:
+            return
+        tags = set(tags)
+        with self._lock:
+            if since is not None and self._stale(tags, since):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, body, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str):
+        with self._lock:
+            self._version += 1
+            for tag in tags:
+                self._invalidated.pop(tag, None)
+                self._invalidated[tag] = self._version
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+            # 무효화 기록은 maxsize 개까지만, 버린 기록보다 먼저 시작한 읽기는 set 하지 않음
+            while len(self._invalidated) > self.maxsize:
+                _, self._floor = self._invalidated.popitem(last=False)
+
+    def _stale(self, tags: Set[str], since: int) -> bool:
+        # self._lock 을 잡은 상태에서만 호출
+        if since < self._floor:
+            return True
+        return any(self._invalidated.get(tag, 0) > since for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str):
+        # self._lock 을 잡은 상태에서만 호출
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+response_cache = ResponseCache()
@@ -1,10 +1,20 @@
 # controllers.py
-from typing import Optional
+import base64
+from typing import List, Optional
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from auth import create_access_token
-from models import User, Post, Comment
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from auth import create_access_token, principal_cache
+from cache import FEED_TAG, post_tag, response_cache, user_tag
+from counters import view_counter
+from passwords import hash_password_async, verify_password_async
+from replicas import mark_write
+from thumbnails import thumbnail_urls
+from models import User, Post, Comment, PostLike
 
 
 # ---------- 요청 바디용 Pydantic ----------
@@ -52,28 +62,41 @@ class UpdatePasswordRequest(BaseModel):
 class ToggleLikeRequest(BaseModel):
     is_like: bool
 
+
+MAX_BATCH_SIZE = 100  # 배치 API 한 번에 처리할 최대 개수
+COMMENT_PAGE_SIZE = 20  # 게시글 상세에 같이 내려주는 댓글 수
+
 # ========== 유저 ==========
+# 모든 컨트롤러는 AsyncSession 을 받아 이벤트 루프 위에서 바로 실행됨 (스레드풀 X)
 
-def signup_controller(db: Session, body: SignupRequest):
+async def signup_controller(db: AsyncSession, body: SignupRequest):
 
     user = User(
         email=body.email,
-        password=body.password, 
+        password=await hash_password_async(body.password),
         nickname=body.nickname,
         profile_image=body.profile_image,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
 
     return {"message": "register_success", "data": {"user_id": user.user_id}}
 
-def login_controller(db, body: LoginRequest):
-    user = db.query(User).filter(User.email == body.email).first()
+async def login_controller(db: AsyncSession, body: LoginRequest):
+    user = await db.scalar(select(User).where(User.email == body.email))
+
+    if user is None:
+        raise HTTPException(status_code=401, detail="아이디 또는 비밀번호가 올바르지 않습니다")
 
-    if user is None or user.password != body.password:
+    ok, needs_rehash = await verify_password_async(body.password, user.password)
+    if not ok:
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호가 올바르지 않습니다")
 
+    if needs_rehash:
+        # 평문 계정이거나 해시 비용 파라미터가 바뀐 경우 → 새 파라미터로 다시 저장
+        user.password = await hash_password_async(body.password)
+        await db.commit()
+
     access_token = create_access_token({"user_id": user.user_id})
 
     return {
@@ -84,8 +107,8 @@ def login_controller(db, body: LoginRequest):
         },
     }
 
-def get_profile_controller(db: Session, user_id: int):
-    user = db.query(User).filter(User.user_id == user_id).first()
+async def get_profile_controller(db: AsyncSession, user_id: int):
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="unauthorized")
 
@@ -100,17 +123,17 @@ def get_profile_controller(db: Session, user_id: int):
     }
 
 
-def update_profile_controller(db: Session, body: UpdateProfileRequest, user_id: int):
-    user = db.query(User).filter(User.user_id == user_id).first()
+async def update_profile_controller(db: AsyncSession, body: UpdateProfileRequest, user_id: int):
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="unauthorized")
 
     if body.nickname is not None:
         # 닉네임 중복 체크
-        exists = (
-            db.query(User)
-            .filter(User.nickname == body.nickname, User.user_id != user_id)
-            .first()
+        exists = await db.scalar(
+            select(User.user_id)
+            .where(User.nickname == body.nickname, User.user_id != user_id)
+            .limit(1)
         )
         if exists:
             raise HTTPException(status_code=400, detail="nickname_duplicate")
@@ -119,26 +142,66 @@ def update_profile_controller(db: Session, body: UpdateProfileRequest, user_id:
     if body.profile_image is not None:
         user.profile_image = body.profile_image
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    mark_write(user_id)
+    principal_cache.evict_user(user_id)
+    if body.nickname is not None:
+        # 닉네임은 피드/상세/댓글 응답에 들어가므로 이 유저가 나온 캐시 항목 전부 무효화
+        response_cache.invalidate(user_tag(user_id))
 
     return {"message": "update_profile_success", "data": {"user_id": user.user_id}}
 
 
-def update_password_controller(db: Session, body: UpdatePasswordRequest, user_id: int):
-    user = db.query(User).filter(User.user_id == user_id).first()
+async def update_password_controller(db: AsyncSession, body: UpdatePasswordRequest, user_id: int):
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=401, detail="unauthorized")
 
-    user.password = body.password  # 실제 서비스라면 해시 필요
-    db.commit()
+    user.password = await hash_password_async(body.password)
+    await db.commit()
+    mark_write(user_id)
+    principal_cache.evict_user(user_id)
 
     return {"message": "update_password_success", "data": {"user_id": user.user_id}}
 
 
+async def delete_user_controller(db: AsyncSession, user_id: int):
+    # 이 유저가 누른 좋아요만큼 각 게시글의 like_count 를 먼저 빼줌
+    liked_post_ids = (
+        await db.scalars(
+            update(Post)
+            .where(Post.post_id.in_(select(PostLike.post_id).where(PostLike.user_id == user_id)))
+            .values(like_count=func.max(func.coalesce(Post.like_count, 0) - 1, 0))
+            .returning(Post.post_id)
+        )
+    ).all()
+    # 댓글이 지워지면 트리거가 다른 유저 글의 comment_count 도 바꿈 → 상세 캐시 무효화 대상
+    commented_post_ids = (
+        await db.scalars(select(Comment.post_id).where(Comment.user_id == user_id).distinct())
+    ).all()
+    # 게시글/댓글/좋아요는 ON DELETE CASCADE 로 같이 삭제됨
+    result = await db.execute(delete(User).where(User.user_id == user_id))
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=401, detail="unauthorized")
+
+    await db.commit()
+    mark_write(user_id)
+    principal_cache.evict_user(user_id)
+    # 이 유저의 글이 빠진 피드 + 이 유저의 글/댓글이 보이던 상세 페이지
+    # + 좋아요 수 / 댓글 수가 바뀐 다른 유저의 게시글 상세 무효화
+    response_cache.invalidate(
+        FEED_TAG,
+        user_tag(user_id),
+        *(post_tag(pid) for pid in set(liked_post_ids) | set(commented_post_ids)),
+    )
+
+    return {"message": "delete_user_success", "data": None}
+
+
 # ========== 게시글 ==========
 
-def create_post_controller(db: Session, body: CreatePostRequest, user_id: int):
+async def create_post_controller(db: AsyncSession, body: CreatePostRequest, user_id: int):
     post = Post(
         user_id=user_id,
         title=body.title,
@@ -146,25 +209,26 @@ def create_post_controller(db: Session, body: CreatePostRequest, user_id: int):
         image=body.image,
     )
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(FEED_TAG)
 
     return {"message": "create_post_success", "data": {"post_id": post.post_id}}
 
 
 
-def list_posts_controller(db: Session, cursor: Optional[int], limit: int):
+async def list_posts_controller(db: AsyncSession, cursor: Optional[int], limit: int):
     # Post + User 조인
     q = (
-        db.query(Post, User)
+        select(Post, User)
         .join(User, Post.user_id == User.user_id)
         .order_by(Post.post_id.desc())
     )
 
     if cursor is not None:
-        q = q.filter(Post.post_id < cursor)
+        q = q.where(Post.post_id < cursor)
 
-    rows = q.limit(limit).all()   # rows: [(Post, User), (Post, User), ...]
+    rows = (await db.execute(q.limit(limit))).all()   # rows: [(Post, User), (Post, User), ...]
 
     has_next = False
     next_cursor = None
@@ -172,6 +236,9 @@ def list_posts_controller(db: Session, cursor: Optional[int], limit: int):
         has_next = True
         next_cursor = rows[-1][0].post_id   # 마지막 Post의 id
 
+    # 목록에는 작은 이미지를 내려줌 (아직 생성 전이면 원본)
+    thumbnails = await thumbnail_urls(db, (post.image for post, _ in rows))
+
     post_dicts = []
     for post, user in rows:
         post_dicts.append(
@@ -182,8 +249,10 @@ def list_posts_controller(db: Session, cursor: Optional[int], limit: int):
                 "title": post.title,
                 "content": post.content,
                 "image": post.image,
+                "image_thumbnail": thumbnails.get(post.image, post.image),
                 "like_count": post.like_count,
-                "view_count": post.view_count,
+                # 아직 DB에 flush 안 된 조회수까지 합쳐서 응답
+                "view_count": (post.view_count or 0) + view_counter.pending(post.post_id),
             }
         )
 
@@ -198,47 +267,219 @@ def list_posts_controller(db: Session, cursor: Optional[int], limit: int):
 
 
 
-def post_detail_controller(db: Session, post_id: int):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
-    if post is None:
-        raise HTTPException(status_code=404, detail="post_not_found")
-    post_user = db.query(User).filter(User.user_id == post.user_id).first()
-    comments = (
-        db.query(Comment)
-        .filter(Comment.post_id == post_id)
-        .order_by(Comment.comment_id.asc())
-        .all()
-    )
+def _fts_query(q: str) -> str:
+    # 사용자가 입력한 검색어를 FTS5 MATCH 문법으로 변환
+    # 단어마다 따옴표로 감싸서 연산자 해석을 막고, 접두 검색(*)으로 조사가 붙은 한국어 단어도 찾음
+    terms = [t.replace('"', '""') for t in q.split()]
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _encode_search_cursor(rank: float, post_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{rank!r}:{post_id}".encode()).decode()
+
+
+def _decode_search_cursor(cursor: str):
+    try:
+        rank, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(rank), int(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_cursor")
+
+
+async def search_posts_controller(db: AsyncSession, q: str, cursor: Optional[str], limit: int):
+    match = _fts_query(q)
+    if not match:
+        raise HTTPException(status_code=400, detail="empty_query")
+
+    # bm25 점수(rank, 작을수록 관련도 높음) → post_id 내림차순으로 정렬하고
+    # 그 두 값을 커서로 써서 다음 페이지를 이어서 가져옴 (OFFSET 없이)
+    params = {"match": match, "limit": limit}
+    cursor_filter = ""
+    if cursor is not None:
+        params["rank"], params["post_id"] = _decode_search_cursor(cursor)
+        cursor_filter = "AND (posts_fts.rank > :rank OR (posts_fts.rank = :rank AND p.post_id < :post_id))"
+
+    rows = (
+        await db.execute(
+            text(
+                f"""
+                SELECT p.post_id, p.user_id, u.nickname, p.title, p.image,
+                       p.like_count, p.view_count,
+                       highlight(posts_fts, 0, '<mark>', '</mark>') AS title_highlight,
+                       snippet(posts_fts, 1, '<mark>', '</mark>', '…', 16) AS snippet,
+                       posts_fts.rank AS rank
+                FROM posts_fts
+                JOIN posts p ON p.post_id = posts_fts.rowid
+                JOIN users u ON u.user_id = p.user_id
+                WHERE posts_fts MATCH :match {cursor_filter}
+                ORDER BY posts_fts.rank, p.post_id DESC
+                LIMIT :limit
+                """
+            ),
+            params,
+        )
+    ).all()
+
+    has_next = False
+    next_cursor = None
+    if len(rows) == limit:
+        has_next = True
+        next_cursor = _encode_search_cursor(rows[-1].rank, rows[-1].post_id)
 
-    comment_dicts = []
-    for c in comments:
-        comment_user = db.query(User).filter(User.user_id == c.user_id).first()
-        comment_dicts.append(
+    post_dicts = []
+    for row in rows:
+        post_dicts.append(
             {
-                "comment_id": c.comment_id,
-                "user_id": c.user_id,
-                "user_nickname": comment_user.nickname if comment_user else None,
-                "content": c.content,
+                "post_id": row.post_id,
+                "user_id": row.user_id,
+                "user_nickname": row.nickname,
+                "title": row.title,
+                "title_highlight": row.title_highlight,
+                "snippet": row.snippet,
+                "image": row.image,
+                "like_count": row.like_count,
+                "view_count": (row.view_count or 0) + view_counter.pending(row.post_id),
+            }
+        )
+
+    return {
+        "message": "search_posts_success",
+        "data": {
+            "posts": post_dicts,
+            "has_next": has_next,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+async def batch_posts_controller(db: AsyncSession, post_ids: List[int]):
+    if not post_ids:
+        raise HTTPException(status_code=400, detail="empty_ids")
+    if len(post_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail="too_many_ids")
+
+    # 게시글 + 작성자를 IN 쿼리 한 번으로 조회
+    rows = (
+        await db.execute(
+            select(Post, User)
+            .join(User, Post.user_id == User.user_id)
+            .where(Post.post_id.in_(set(post_ids)))
+        )
+    ).all()
+    by_id = {post.post_id: (post, user) for post, user in rows}
+
+    # 요청한 순서대로 응답, 없는 id 는 not_found 로 따로 알려줌
+    post_dicts = []
+    not_found = []
+    for post_id in post_ids:
+        if post_id not in by_id:
+            not_found.append(post_id)
+            continue
+        post, user = by_id[post_id]
+        post_dicts.append(
+            {
+                "post_id": post.post_id,
+                "user_id": post.user_id,
+                "user_nickname": user.nickname,
+                "title": post.title,
+                "content": post.content,
+                "image": post.image,
+                "like_count": post.like_count,
+                "view_count": (post.view_count or 0) + view_counter.pending(post.post_id),
             }
         )
 
+    return {
+        "message": "get_posts_batch_success",
+        "data": {"posts": post_dicts, "not_found": not_found},
+    }
+
+
+def _comment_dict(c: Comment) -> dict:
+    return {
+        "comment_id": c.comment_id,
+        "user_id": c.user_id,
+        "user_nickname": c.user.nickname if c.user else None,
+        "content": c.content,
+    }
+
+
+async def _comment_page(db: AsyncSession, post_id: int, cursor: Optional[int], limit: int):
+    # comment_id 기준 keyset 페이징 → (post_id, comment_id) 인덱스로 필요한 만큼만 읽음
+    q = (
+        select(Comment)
+        .options(joinedload(Comment.user))
+        .where(Comment.post_id == post_id)
+        .order_by(Comment.comment_id.asc())
+    )
+    if cursor is not None:
+        q = q.where(Comment.comment_id > cursor)
+
+    comments = (await db.scalars(q.limit(limit))).all()
+
+    has_next = False
+    next_cursor = None
+    if len(comments) == limit:
+        has_next = True
+        next_cursor = comments[-1].comment_id   # 마지막 댓글의 id
+
+    return [_comment_dict(c) for c in comments], has_next, next_cursor
+
+
+async def post_detail_controller(db: AsyncSession, post_id: int):
+    # 게시글 + 작성자 JOIN 한 번, 댓글 첫 페이지 + 작성자 한 번
+    # → 댓글이 몇 개든 쿼리 수와 응답 크기가 일정함 (나머지 댓글은 GET /posts/{post_id}/comments)
+    # 댓글 수는 COUNT(*) 대신 트리거가 관리하는 posts.comment_count 사용
+    post = await db.scalar(
+        select(Post)
+        .options(joinedload(Post.user))
+        .where(Post.post_id == post_id)
+    )
+    if post is None:
+        raise HTTPException(status_code=404, detail="post_not_found")
+
+    # 조회수는 바로 UPDATE 하지 않고 버퍼에 쌓아뒀다가 모아서 반영 (counters.py)
+    view_counter.hit(post_id)
+
+    comment_dicts, has_next, next_cursor = await _comment_page(db, post_id, None, COMMENT_PAGE_SIZE)
+
     detail = {
         "post_id": post.post_id,
         "user_id": post.user_id,
-        "user_nickname": post_user.nickname if post_user else None,
+        "user_nickname": post.user.nickname if post.user else None,
         "title": post.title,
         "content": post.content,
         "image": post.image,
         "like_count": post.like_count,
-        "view_count": post.view_count,
+        "view_count": (post.view_count or 0) + view_counter.pending(post.post_id),
         "comments": comment_dicts,
+        "comment_count": post.comment_count or 0,
+        "comments_has_next": has_next,
+        "comments_next_cursor": next_cursor,
     }
 
     return {"message": "get_post_detail_success", "data": detail}
 
 
-def update_post_controller(db: Session, post_id: int, body: UpdatePostRequest, user_id: int):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
+async def list_comments_controller(db: AsyncSession, post_id: int, cursor: Optional[int], limit: int):
+    post_exists = await db.scalar(select(Post.post_id).where(Post.post_id == post_id))
+    if post_exists is None:
+        raise HTTPException(status_code=404, detail="post_not_found")
+
+    comment_dicts, has_next, next_cursor = await _comment_page(db, post_id, cursor, limit)
+
+    return {
+        "message": "get_comments_success",
+        "data": {
+            "comments": comment_dicts,
+            "has_next": has_next,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+async def update_post_controller(db: AsyncSession, post_id: int, body: UpdatePostRequest, user_id: int):
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="post_not_found")
 
@@ -252,51 +493,86 @@ def update_post_controller(db: Session, post_id: int, body: UpdatePostRequest, u
     if body.image is not None:
         post.image = body.image
 
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(FEED_TAG, post_tag(post_id))
 
     return {"message": "update_post_success", "data": {"post_id": post.post_id}}
 
 
-def delete_post_controller(db: Session, post_id: int, user_id: int):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
-    if post is None:
+async def delete_post_controller(db: AsyncSession, post_id: int, user_id: int):
+    owner_id = await db.scalar(select(Post.user_id).where(Post.post_id == post_id))
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="post_not_found")
 
-    if post.user_id != user_id:
+    if owner_id != user_id:
         raise HTTPException(status_code=403, detail="forbidden")
 
-    db.delete(post)
-    db.commit()
+    # DELETE 한 문장으로 끝 → 댓글/좋아요는 DB 의 ON DELETE CASCADE 가 지움 (ORM 으로 로딩 X)
+    await db.execute(delete(Post).where(Post.post_id == post_id))
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(FEED_TAG, post_tag(post_id))
 
     return {"message": "delete_post_success", "data": None}
 
-def toggle_like_controller(db: Session, post_id: int, is_like: bool):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
-    if post is None:
-        raise HTTPException(status_code=404, detail="post_not_found")
+async def toggle_like_controller(db: AsyncSession, post_id: int, is_like: bool, user_id: int):
+    # 좋아요 여부는 post_likes (user_id, post_id) 유니크 제약으로 관리
+    # 이미 누른 상태에서 또 누르거나, 안 누른 상태에서 취소하면 아무 행도 바뀌지 않음
+    # 없는 게시글이면 좋아요 INSERT 는 외래키 에러, 취소는 아래 UPDATE ... RETURNING 이 빈 결과 → 둘 다 404
+    if is_like:
+        try:
+            result = await db.execute(
+                sqlite_insert(PostLike)
+                .values(user_id=user_id, post_id=post_id)
+                .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+            )
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="post_not_found")
+    else:
+        result = await db.execute(
+            delete(PostLike).where(
+                PostLike.user_id == user_id,
+                PostLike.post_id == post_id,
+            )
+        )
 
-    delta = 1 if is_like else -1
-    new_count = (post.like_count or 0) + delta
-    if new_count < 0:
-        new_count = 0
+    # 실제로 바뀐 경우에만 카운트 반영
+    # 파이썬에서 읽고 더하지 않고 SQL 안에서 더해서 동시 요청에도 값이 유실되지 않음
+    delta = 0
+    if result.rowcount == 1:
+        delta = 1 if is_like else -1
+
+    like_count = (
+        await db.execute(
+            update(Post)
+            .where(Post.post_id == post_id)
+            .values(like_count=func.coalesce(Post.like_count, 0) + delta)
+            .returning(Post.like_count)
+        )
+    ).scalar()
+
+    if like_count is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="post_not_found")
 
-    post.like_count = new_count
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(FEED_TAG, post_tag(post_id))
 
     return {
         "message": "toggle_like_success",
         "data": {
-            "post_id": post.post_id,
-            "like_count": post.like_count,
+            "post_id": post_id,
+            "like_count": like_count,
         },
     }
 
 # ========== 댓글 ==========
 
-def create_comment_controller(db: Session, post_id: int, body: CreateCommentRequest, user_id: int):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
+async def create_comment_controller(db: AsyncSession, post_id: int, body: CreateCommentRequest, user_id: int):
+    post = await db.get(Post, post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="post_not_found")
 
@@ -306,8 +582,9 @@ def create_comment_controller(db: Session, post_id: int, body: CreateCommentRequ
         content=body.content,
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(post_tag(post_id))
 
     return {
         "message": "create_comment_success",
@@ -320,11 +597,53 @@ def create_comment_controller(db: Session, post_id: int, body: CreateCommentRequ
     }
 
 
-def update_comment_controller(db: Session, post_id: int, comment_id: int, body: UpdateCommentRequest, user_id: int):
-    comment = (
-        db.query(Comment)
-        .filter(Comment.comment_id == comment_id, Comment.post_id == post_id)
-        .first()
+async def create_comments_batch_controller(db: AsyncSession, post_id: int, bodies: List[CreateCommentRequest], user_id: int):
+    if not bodies:
+        raise HTTPException(status_code=400, detail="empty_batch")
+    if len(bodies) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail="too_many_items")
+
+    post_exists = await db.scalar(select(Post.post_id).where(Post.post_id == post_id))
+    if post_exists is None:
+        raise HTTPException(status_code=404, detail="post_not_found")
+
+    # 모든 댓글의 작성자는 현재 로그인한 유저로 고정 (요청 바디로 다른 유저를 지정할 수 없음)
+    rows = [
+        {"post_id": post_id, "user_id": user_id, "content": body.content}
+        for body in bodies
+    ]
+    # RETURNING 결과 순서는 DB 가 보장하지 않음
+    # → sort_by_parameter_order 로 rows 순서에 맞춰 받고, content 도 같이 받아서 id 와 짝이 맞는 값을 그대로 응답
+    inserted = (
+        await db.execute(
+            insert(Comment).returning(Comment.comment_id, Comment.content, sort_by_parameter_order=True),
+            rows,
+        )
+    ).all()
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(post_tag(post_id))
+
+    return {
+        "message": "create_comments_batch_success",
+        "data": {
+            "comments": [
+                {
+                    "comment_id": comment_id,
+                    "post_id": post_id,
+                    "user_id": user_id,
+                    "content": content,
+                }
+                for comment_id, content in inserted
+            ],
+        },
+    }
+
+
+async def update_comment_controller(db: AsyncSession, post_id: int, comment_id: int, body: UpdateCommentRequest, user_id: int):
+    comment = await db.scalar(
+        select(Comment)
+        .where(Comment.comment_id == comment_id, Comment.post_id == post_id)
     )
     if comment is None:
         raise HTTPException(status_code=404, detail="comment_not_found")
@@ -333,8 +652,9 @@ def update_comment_controller(db: Session, post_id: int, comment_id: int, body:
         raise HTTPException(status_code=403, detail="forbidden")
 
     comment.content = body.content
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    mark_write(user_id)
+    response_cache.invalidate(post_tag(post_id))
 
     return {
         "message": "update_comment_success",
@@ -0,0 +1,117 @@
+# counters.py
+# 조회수 write-behind 버퍼
+# GET /posts/{post_id} 마다 UPDATE 를 날리면 읽기 경로가 쓰기 경로가 되어 SQLite writer lock 에 줄을 서게 됨
+# → 메모리에 게시글별 증가분을 모아뒀다가 N ms 마다 또는 M 건이 쌓이면 UPDATE 한 번으로 반영
+import threading
+from typing import Dict
+
+from sqlalchemy import case, func, update
+
+from db import SessionLocal
+from models import Post
+
+FLUSH_INTERVAL_MS = 1000   # 이 주기마다 flush
+FLUSH_MAX_EVENTS = 500     # 버퍼에 이만큼 쌓이면 주기를 기다리지 않고 flush
+
+
+class ViewCounter:
+    def __init__(self, interval_ms: int = FLUSH_INTERVAL_MS, max_events: int = FLUSH_MAX_EVENTS):
+        self.interval = interval_ms / 1000
+        self.max_events = max_events
+        self._pending: Dict[int, int] = {}   # post_id -> 아직 DB에 반영 안 된 증가분
+        self._flushing: Dict[int, int] = {}  # flush 중인 증가분 (커밋 전까지 읽기 쪽에서 계속 더해줌)
+        self._events = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- 기록 / 조회 ----------
+
+    def hit(self, post_id: int, n: int = 1):
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + n
+            self._events += n
+            full = self._events >= self.max_events
+        if full:
+            self._wakeup.set()
+
+    def pending(self, post_id: int) -> int:
+        # 아직 flush 되지 않은 증가분 (응답의 view_count 에 더해서 보여줌)
+        with self._lock:
+            return self._pending.get(post_id, 0) + self._flushing.get(post_id, 0)
+
+    def depth(self) -> int:
+        # 버퍼에 쌓여 있는 이벤트 수
+        with self._lock:
+            return self._events
+
+    # ---------- flush ----------
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = self._pending
+                self._flushing = batch
+                self._pending = {}
+                self._events = 0
+
+            # UPDATE posts SET view_count = view_count + CASE post_id WHEN .. THEN .. END
+            # WHERE post_id IN (...)  → 게시글 개수와 상관없이 한 문장
+            stmt = (
+                update(Post)
+                .where(Post.post_id.in_(list(batch)))
+                .values(
+                    view_count=func.coalesce(Post.view_count, 0)
+                    + case(batch, value=Post.post_id, else_=0)
+                )
+            )
+            committed = False
+            db = SessionLocal()
+            try:
+                db.execute(stmt)
+                db.commit()
+                committed = True
+            except Exception as e:
+                db.rollback()
+                print("[WARN] 조회수 flush 실패:", e)
+            finally:
+                db.close()
+                with self._lock:
+                    if not committed:
+                        # 실패한 증가분은 다음 flush 때 다시 시도
+                        # _flushing 을 비우는 것과 같은 lock 안에서 되돌려야 pending() 이 두 번 세지 않음
+                        for post_id, n in batch.items():
+                            self._pending[post_id] = self._pending.get(post_id, 0) + n
+                            self._events += n
+                    self._flushing = {}
+
+            return len(batch) if committed else 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # 종료 시 남은 증가분까지 반영
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+view_counter = ViewCounter()
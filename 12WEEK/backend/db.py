@@ -1,15 +1,69 @@
 # db.py
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from typing import AsyncGenerator, Generator
+
+from metrics import instrument_engine
+from slowlog import slow_query_log
 
 DATABASE_URL = "sqlite:///./app.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./app.db"
+
+# ----- SQLite 연결 설정 프로필 -----
+# 배포 환경별로 DB_PROFILE 환경변수로 선택 (기본값: production)
+# - production: WAL 로 읽기/쓰기가 서로 막지 않게 하고, fsync 횟수와 디스크 I/O 를 줄임
+# - dev: SQLite 기본 설정 그대로 (rollback journal, synchronous=FULL)
+SQLITE_PROFILES = {
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",        # WAL 에서는 NORMAL 이어도 DB 손상 없음 (전원 장애 시 마지막 커밋만 유실 가능)
+        "mmap_size": 256 * 1024 * 1024,  # 256MB 까지 mmap 으로 읽기
+        "cache_size": -64000,            # 음수는 KB 단위 → 약 64MB 페이지 캐시
+        "busy_timeout": 5000,            # writer lock 대기 ms (바로 database is locked 에러 X)
+        "temp_store": "MEMORY",
+    },
+    "dev": {},
+}
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+
+
+def apply_sqlite_pragmas(dbapi_conn, profile: str = DB_PROFILE):
+    pragmas = SQLITE_PROFILES[profile]
+    cursor = dbapi_conn.cursor()
+    # 프로필과 상관없이 항상 켬 (SQLite 는 기본값이 OFF 라 ON DELETE CASCADE 가 동작하지 않음)
+    cursor.execute("PRAGMA foreign_keys=ON")
+    for key, value in pragmas.items():
+        cursor.execute(f"PRAGMA {key}={value}")
+    cursor.close()
+
 
+def _on_connect(dbapi_conn, connection_record):
+    apply_sqlite_pragmas(dbapi_conn)
+
+# 동기 엔진: 마이그레이션, 조회수 flush 스레드 등 요청 경로 밖에서 사용
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # SQLite에서 필요
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+event.listen(engine, "connect", _on_connect)
+instrument_engine(engine)
+slow_query_log.attach(engine)
+
+# 비동기 엔진: API 요청 경로에서 사용 (aiosqlite)
+# 라우트가 스레드풀 슬롯을 잡지 않고 이벤트 루프 위에서 바로 DB를 기다림
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+event.listen(async_engine.sync_engine, "connect", _on_connect)
+instrument_engine(async_engine.sync_engine)  # SQL 횟수 / 시간 (metrics.py)
+slow_query_log.attach(async_engine.sync_engine)  # 느린 쿼리 로그 (slowlog.py)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,  # commit 후 속성 접근 시 다시 SELECT 하지 않도록
+)
 
 Base = declarative_base()
 
@@ -20,3 +74,8 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,172 @@
+# export.py
+# 게시글 + 댓글 NDJSON 내보내기 (한 줄에 게시글 하나)
+# - 테이블 전체를 .all() 로 올리지 않고 yield_per 로 EXPORT_CHUNK_SIZE 개씩 스트리밍
+# - 댓글은 게시글 청크 단위로 IN 쿼리 한 번씩, 이것도 yield_per 로 EXPORT_CHUNK_SIZE 개씩 받아서
+#   받는 대로 해당 게시글 줄에 이어 씀 → 댓글이 아주 많은 게시글이 있어도 메모리는 청크 크기에만 비례
+# - since_post_id 로 증분 내보내기, gzip 은 청크마다 바로 압축
+#
+# API:  GET /export/posts.ndjson?since_post_id=&gzip=   (관리자만)
+# CLI:  python export.py --since-post-id 100 --gzip -o posts.ndjson.gz
+import argparse
+import sys
+import zlib
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Comment, Post
+from responses import dumps
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def _posts_query(since_post_id: Optional[int]):
+    # ORM 객체 대신 컬럼만 조회 → identity map 에 쌓이지 않음
+    q = select(
+        Post.post_id, Post.user_id, Post.title, Post.content, Post.image,
+        Post.like_count, Post.view_count, Post.created_at,
+    ).order_by(Post.post_id.asc()).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    if since_post_id is not None:
+        q = q.where(Post.post_id > since_post_id)
+    return q
+
+
+def _comments_query(post_ids: List[int]):
+    return (
+        select(Comment.comment_id, Comment.post_id, Comment.user_id, Comment.content, Comment.created_at)
+        .where(Comment.post_id.in_(post_ids))
+        .order_by(Comment.post_id, Comment.comment_id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+
+
+def _post_head(post) -> bytes:
+    # 게시글 한 줄에서 댓글 배열 앞부분까지: {"post_id":...,"created_at":...,"comments":[
+    line = dumps(
+        {
+            "post_id": post.post_id,
+            "user_id": post.user_id,
+            "title": post.title,
+            "content": post.content,
+            "image": post.image,
+            "like_count": post.like_count,
+            "view_count": post.view_count,
+            "created_at": post.created_at.isoformat() if post.created_at else None,
+        }
+    )
+    return line[:-1] + b',"comments":['
+
+
+def _comment_json(row) -> bytes:
+    return dumps(
+        {
+            "comment_id": row.comment_id,
+            "user_id": row.user_id,
+            "content": row.content,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+    )
+
+
+class _ChunkWriter:
+    # 게시글 청크 하나를 NDJSON 으로 씀
+    # 댓글은 (post_id, comment_id) 순서로 여러 번에 나눠 들어오고, 들어온 만큼 바로 바이트로 돌려줌
+    def __init__(self, posts: List):
+        self.posts = posts
+        self.index = 0          # 아직 닫지 않은 게시글 위치
+        self.opened = False     # posts[index] 의 앞부분을 썼는지
+        self.has_comment = False
+
+    def _open(self, out: List[bytes]):
+        if not self.opened:
+            out.append(_post_head(self.posts[self.index]))
+            self.opened = True
+            self.has_comment = False
+
+    def _close(self, out: List[bytes]):
+        self._open(out)
+        out.append(b"]}\n")
+        self.index += 1
+        self.opened = False
+
+    def add_comments(self, rows: Iterable) -> bytes:
+        out: List[bytes] = []
+        for row in rows:
+            # 이 댓글의 게시글 앞에 있는 게시글은 댓글이 다 나왔으므로 닫음
+            while self.posts[self.index].post_id != row.post_id:
+                self._close(out)
+            self._open(out)
+            if self.has_comment:
+                out.append(b",")
+            out.append(_comment_json(row))
+            self.has_comment = True
+        return b"".join(out)
+
+    def finish(self) -> bytes:
+        out: List[bytes] = []
+        while self.index < len(self.posts):
+            self._close(out)
+        return b"".join(out)
+
+
+def iter_export(db: Session, since_post_id: Optional[int] = None) -> Iterator[bytes]:
+    result = db.execute(_posts_query(since_post_id))
+    for posts in result.partitions():
+        writer = _ChunkWriter(posts)
+        comments = db.execute(_comments_query([p.post_id for p in posts]))
+        for comment_rows in comments.partitions():
+            yield writer.add_comments(comment_rows)
+        yield writer.finish()
+
+
+async def aiter_export(db: AsyncSession, since_post_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    result = await db.stream(_posts_query(since_post_id))
+    async for posts in result.partitions():
+        writer = _ChunkWriter(posts)
+        comments = await db.stream(_comments_query([p.post_id for p in posts]))
+        async for comment_rows in comments.partitions():
+            yield writer.add_comments(comment_rows)
+        yield writer.finish()
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # wbits=31 → gzip 헤더 포함
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+async def agzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+if __name__ == "__main__":
+    from db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="게시글 + 댓글 NDJSON 내보내기")
+    parser.add_argument("--since-post-id", type=int, default=None, help="이 id 보다 큰 게시글만 내보냄")
+    parser.add_argument("--gzip", action="store_true", help="gzip 으로 압축")
+    parser.add_argument("-o", "--output", default="-", help="저장할 파일 (기본: stdout)")
+    args = parser.parse_args()
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    db = SessionLocal()
+    try:
+        chunks = iter_export(db, args.since_post_id)
+        if args.gzip:
+            chunks = gzip_stream(chunks)
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        db.close()
+        if out is not sys.stdout.buffer:
+            out.close()
@@ -0,0 +1,309 @@
+# loadtest.py
+# 커뮤니티 API 부하 테스트 (open-loop) + 라우트별 p50/p95/p99 리포트
+# - 유저 USERS 명을 /users/signup (이미 있으면 건너뜀) → /users/login 으로 로그인시켜 토큰 확보
+# - 정해진 도착률(--rate, 초당 요청)로 시나리오를 실행: 앞 요청이 끝나기를 기다리지 않음 (open-loop)
+#   → 서버가 느려져도 요청이 줄지 않아서 실제 트래픽처럼 지연이 쌓이는 게 그대로 보임
+#   → 지연 시간은 "보내야 했던 시각" 부터 잼 (클라이언트 쪽 대기도 포함)
+# - 시나리오 비율 (--mix): 피드 / 상세 / 좋아요 / 댓글 / 이미지 업로드
+# - 결과 JSON (--out) 에 라우트별 처리량, 상태 코드, p50/p95/p99 저장
+# - --baseline 과 비교해서 p95/p99 가 --tolerance 이상 느려졌거나 에러율이 늘면 종료 코드 1 (배포 전 체크용)
+#
+# 서버는 rate limit 을 끄고 띄움:  RATE_LIMIT_ENABLED=0 uvicorn main:app
+# 실행:      python loadtest.py --rate 50 --duration 60 --out report.json --baseline loadtest_baseline.json
+# 기준 갱신: python loadtest.py --rate 50 --duration 60 --save-baseline loadtest_baseline.json
+#
+# httpx 필요 (pip install httpx)
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_MIX = "feed=45,detail=35,like=10,comment=7,upload=3"
+USER_PASSWORD = "loadtest-pw"
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def random_png(size: int = 32) -> bytes:
+    # 매번 내용이 다른 작은 PNG (업로드가 해시 중복 제거에 걸리지 않도록)
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    raw = b"".join(b"\x00" + os.urandom(size * 3) for _ in range(size))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, route: str, started: float, status):
+        self.latencies[route].append(time.perf_counter() - started)
+        self.statuses[route][str(status)] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for route in sorted(self.latencies):
+            values = sorted(self.latencies[route])
+            statuses = dict(self.statuses[route])
+            errors = sum(n for code, n in statuses.items() if not code.startswith(("2", "3")))
+            routes[route] = {
+                "count": len(values),
+                "errors": errors,
+                "error_rate": errors / len(values),
+                "status": statuses,
+                "throughput_rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        total = sum(r["count"] for r in routes.values())
+        return {
+            "elapsed_s": elapsed,
+            "total_requests": total,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "routes": routes,
+        }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, users: int):
+        self.client = client
+        self.recorder = recorder
+        self.users = users
+        self.tokens: List[str] = []
+        self.post_ids: List[int] = []
+
+    async def request(self, route: str, method: str, url: str, started: Optional[float] = None, **kwargs):
+        # started: 시나리오가 시작됐어야 하는 시각 (open-loop 지연 측정 기준)
+        started = time.perf_counter() if started is None else started
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.add(route, started, type(e).__name__)
+            return None
+        self.recorder.add(route, started, response.status_code)
+        return response
+
+    # ---------- 준비 ----------
+
+    async def _login(self, i: int) -> str:
+        email = f"loadtest{i}@example.com"
+        await self.client.post(
+            "/users/signup",
+            data={"email": email, "password": USER_PASSWORD, "nickname": f"loadtest{i}"},
+        )  # 이미 있으면 400, 무시
+        while True:
+            response = await self.request(
+                "POST /users/login", "POST", "/users/login", json={"email": email, "password": USER_PASSWORD}
+            )
+            if response is not None and response.status_code == 429:
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+                continue
+            if response is None or response.status_code != 200:
+                raise RuntimeError(f"{email} 로그인 실패: {response.status_code if response else 'error'}")
+            return response.json()["data"]["access_token"]
+
+    async def setup(self, posts_per_user: int):
+        self.tokens = await asyncio.gather(*[self._login(i) for i in range(self.users)])
+        response = await self.client.get("/posts", params={"limit": 50})
+        self.post_ids = [p["post_id"] for p in response.json()["data"]["posts"]]
+        # 게시글이 부족하면 유저들이 돌아가며 작성
+        for n in range(self.users * posts_per_user - len(self.post_ids)):
+            response = await self.client.post(
+                "/posts",
+                json={"title": f"load test {n}", "content": "부하 테스트용 게시글"},
+                headers={"Authorization": f"Bearer {self.tokens[n % self.users]}"},
+            )
+            if response.status_code == 200:
+                self.post_ids.append(response.json()["data"]["post_id"])
+        if not self.post_ids:
+            raise RuntimeError("게시글이 없어서 상세/좋아요/댓글 시나리오를 실행할 수 없음")
+
+    # ---------- 시나리오 ----------
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {random.choice(self.tokens)}"}
+
+    async def feed(self, started: float):
+        # 첫 페이지 → 절반은 다음 페이지까지
+        response = await self.request("GET /posts", "GET", "/posts", started, params={"limit": 10})
+        if response is None or response.status_code != 200:
+            return
+        data = response.json()["data"]
+        ids = [p["post_id"] for p in data["posts"]]
+        if ids:
+            self.post_ids[random.randrange(len(self.post_ids))] = random.choice(ids)
+        if data.get("next_cursor") and random.random() < 0.5:
+            await self.request("GET /posts", "GET", "/posts", params={"limit": 10, "cursor": data["next_cursor"]})
+
+    async def detail(self, started: float):
+        await self.request("GET /posts/{post_id}", "GET", f"/posts/{random.choice(self.post_ids)}", started)
+
+    async def like(self, started: float):
+        await self.request(
+            "POST /posts/{post_id}/like", "POST", f"/posts/{random.choice(self.post_ids)}/like", started,
+            json={"is_like": random.random() < 0.7}, headers=self._auth(),
+        )
+
+    async def comment(self, started: float):
+        await self.request(
+            "POST /posts/{post_id}/comments", "POST", f"/posts/{random.choice(self.post_ids)}/comments", started,
+            json={"content": "부하 테스트 댓글"}, headers=self._auth(),
+        )
+
+    async def upload(self, started: float):
+        await self.request(
+            "POST /upload/image", "POST", "/upload/image", started,
+            files={"file": ("load.png", random_png(), "image/png")}, headers=self._auth(),
+        )
+
+    # ---------- 실행 ----------
+
+    async def run(self, rate: float, duration: float, mix: Dict[str, float]):
+        scenarios = [getattr(self, name) for name in mix]
+        weights = list(mix.values())
+        tasks = set()
+        start = time.perf_counter()
+        next_at = start
+        while next_at - start < duration:
+            # 포아송 도착: 간격이 지수분포
+            next_at += random.expovariate(rate)
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scenario = random.choices(scenarios, weights)[0]
+            task = asyncio.create_task(scenario(next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+
+async def closed_loop(concurrency: int, duration: float, call) -> dict:
+    # 벤치마크 스크립트(bench_*.py)용: 클라이언트 concurrency 개가 응답을 받자마자 다음 요청 (closed-loop)
+    # call(recorder) 는 요청 하나를 보내고 recorder.add 로 기록하는 코루틴
+    recorder = Recorder()
+    start = time.perf_counter()
+
+    async def worker():
+        while time.perf_counter() - start < duration:
+            await call(recorder)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return recorder.report(time.perf_counter() - start)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    # 기준보다 p95/p99 가 tolerance 이상 느려졌거나 에러율이 1%p 넘게 늘어난 라우트
+    regressions = []
+    for route, base in baseline["routes"].items():
+        current = report["routes"].get(route)
+        if current is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{route} {key}: {base[key]:.1f} → {current[key]:.1f}")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{route} error_rate: {base['error_rate']:.2%} → {current['error_rate']:.2%}")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"{'route':36} {'count':>7} {'rps':>8} {'err':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, r in report["routes"].items():
+        print(
+            f"{route:36} {r['count']:7d} {r['throughput_rps']:8.1f} {r['errors']:6d} "
+            f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}"
+        )
+    print(f"total {report['total_requests']} requests, {report['throughput_rps']:.1f} req/s")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, weight = part.split("=")
+        if name not in ("feed", "detail", "like", "comment", "upload"):
+            raise argparse.ArgumentTypeError(f"알 수 없는 시나리오: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        # 준비 단계(로그인)는 따로 기록 → 본 측정의 처리량에 섞이지 않음
+        setup_recorder = Recorder()
+        test = LoadTest(client, setup_recorder, args.users)
+        setup_started = time.perf_counter()
+        await test.setup(args.posts_per_user)
+        setup_elapsed = time.perf_counter() - setup_started
+
+        test.recorder = Recorder()
+        elapsed = await test.run(args.rate, args.duration, parse_mix(args.mix))
+
+    report = test.recorder.report(elapsed)
+    report["setup"] = setup_recorder.report(setup_elapsed)
+    report["config"] = {
+        "base_url": args.base_url, "rate": args.rate, "duration": args.duration,
+        "users": args.users, "mix": args.mix,
+    }
+    print_report(report)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준 저장: {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("성능 저하:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("기준 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="커뮤니티 API open-loop 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=20, help="초당 시나리오 시작 수")
+    parser.add_argument("--duration", type=float, default=30, help="초")
+    parser.add_argument("--users", type=int, default=10, help="로그인할 유저 수")
+    parser.add_argument("--posts-per-user", type=int, default=3, help="게시글이 부족하면 유저마다 만들 개수")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="시나리오 비율 (예: feed=45,detail=35,...)")
+    parser.add_argument("--connections", type=int, default=100, help="최대 동시 연결 수")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 JSON 파일")
+    parser.add_argument("--save-baseline", default=None, help="이번 결과를 기준으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p95/p99 증가 비율 (0.2 = 20%)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
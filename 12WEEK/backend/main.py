@@ -1,16 +1,36 @@
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from db import engine, Base
+from cache import response_cache
+from counters import view_counter
+from db import engine
+import metrics
+from media import MediaFiles
+from migrations import run_migrations
+from profiler import PROFILER_ENABLED, ProfilerMiddleware
+from ratelimit import RateLimitMiddleware
+from replicas import replica_syncer
 from router import router
+from storage import UploadSizeLimitMiddleware
+import thumbnails
 
-Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(title="과즙상 모임 커뮤니티 API")
 
+# 로그인 / 업로드 / 예측 요청 수 제한 (ratelimit.py)
+# CORS 보다 먼저 등록 → 429 응답에도 CORS 헤더가 붙음
+app.add_middleware(RateLimitMiddleware)
+
+# 업로드 크기 제한: Content-Length 가 MAX_UPLOAD_BYTES 를 넘으면 본문을 받기 전에 413 (storage.py)
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# 요청 단위 샘플링 프로파일러 (profiler.py), 꺼져 있으면 등록하지 않음
+if PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,11 +46,36 @@ UPLOAD_DIR = Path("static/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
         
 
-app.mount("/media", StaticFiles(directory=str(MEDIA_DIR)), name="media")
+# 내용 해시 파일명은 immutable 캐시, 나머지는 ETag 재검증 (media.py)
+app.mount("/media", MediaFiles(directory=str(MEDIA_DIR)), name="media")
+
+
+@app.on_event("startup")
+def startup():
+    view_counter.start()
+    replica_syncer.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    # 버퍼에 남은 조회수까지 DB에 반영하고 종료
+    view_counter.stop()
+    replica_syncer.stop()
+    thumbnails.shutdown()
 
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "view_buffer_depth": view_counter.depth(),
+        "response_cache": response_cache.stats(),
+    }
+
+
+# Prometheus 스크랩용 (metrics.py)
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 app.include_router(router)
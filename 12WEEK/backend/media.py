@@ -0,0 +1,42 @@
+# media.py
+# /media 정적 파일 캐시 정책
+# - 파일명에 SHA-256 이 들어간 파일(업로드 원본, 썸네일)은 내용이 절대 바뀌지 않음
+#   → Cache-Control: immutable 1년 + 파일명 기반 강한 ETag (재방문 시 요청 자체가 안 나감)
+# - 그 외 예전 파일(uuid 이름, 프로필 원본 이름)은 매번 재검증 → 바뀌지 않았으면 304
+# - Range 요청, 304 처리, ASGI 서버가 지원하면 http.response.pathsend(제로카피 전송)는
+#   Starlette FileResponse 가 처리
+import os
+import re
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+CONTENT_HASH_RE = re.compile(r"[0-9a-f]{64}")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+class MediaFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+
+        stem = Path(full_path).stem
+        if CONTENT_HASH_RE.search(stem):
+            # 파일명 자체가 내용 해시 → 그대로 강한 ETag 로 사용 (파일을 다시 읽을 필요 없음)
+            headers = {"etag": f'"{stem}"', "cache-control": IMMUTABLE_CACHE_CONTROL}
+        else:
+            headers = {"cache-control": REVALIDATE_CACHE_CONTROL}
+
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
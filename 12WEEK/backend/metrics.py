@@ -0,0 +1,265 @@
+# metrics.py
+# Prometheus 텍스트 형식 메트릭 (GET /metrics)
+# - 라우트별 응답 시간 히스토그램 / 처리 중인 요청 수 (MetricsRoute, router.py 의 APIRouter 에 route_class 로 등록)
+# - SQL 실행 횟수 / 시간 (db.py 엔진의 before/after_cursor_execute 이벤트) → 요청마다 몇 번 쿼리했는지도 기록
+# - 스레드풀(run_in_threadpool) 사용 중인 스레드 / 대기 중인 작업 수 → 스크랩할 때만 계산
+# - 과일·채소 예측 단계별 시간 (decode / preprocess / forward)
+#
+# prometheus_client 없이 필요한 만큼만 구현: 값 갱신은 dict 조회 + lock 한 번이라 요청 경로 부담이 거의 없음
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+# 지금 처리 중인 라우트 템플릿 (예: "/posts/{post_id}"), 요청 밖(백그라운드 스레드)이면 None
+current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_route", default=None)
+# 지금 요청에서 실행한 SQL [횟수, 시간]
+_request_db: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_db", default=None)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_format(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, name, help, labelnames=(), callback: Callable[[], float] = None):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[tuple, float] = {}
+        self.callback = callback  # 있으면 스크랩할 때 호출해서 값을 얻음 (라벨 없는 게이지만)
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def _samples(self):
+        if self.callback is not None:
+            return [f"{self.name} {_format(self.callback())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_format(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[tuple, list] = {}  # labels -> [버킷별 개수..., +Inf 개수, sum, count]
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 3)
+            row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for labels, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-2]):
+                cumulative += n
+                le = 'le="' + _format(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_format(row[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {row[-1]}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> bytes:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ---------- HTTP ----------
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "라우트별 요청 처리 시간", ("method", "route", "status")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "라우트별 처리 중인 요청 수", ("method", "route")
+)
+db_statements_per_request = Histogram(
+    "db_statements_per_request", "요청 하나에서 실행한 SQL 개수", ("route",), buckets=COUNT_BUCKETS
+)
+db_seconds_per_request = Histogram(
+    "db_seconds_per_request", "요청 하나에서 SQL 실행에 쓴 시간", ("route",), buckets=DB_BUCKETS
+)
+
+
+class MetricsRoute(APIRoute):
+    # 라우트 핸들러(파라미터 파싱, 의존성, 응답 직렬화 포함)를 감싸서 시간 / 처리 중 요청 수 / SQL 개수 기록
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request):
+            method = request.method
+            route_token = current_route.set(route)
+            db_token = _request_db.set([0, 0.0])
+            http_requests_in_flight.inc(method, route)
+            status = 500
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                # 파라미터 / 본문 검증 실패는 FastAPI 기본 핸들러가 422 로 응답
+                status = 422
+                raise
+            finally:
+                http_request_duration.observe(time.perf_counter() - start, method, route, status)
+                http_requests_in_flight.dec(method, route)
+                statements, db_seconds = _request_db.get()
+                db_statements_per_request.observe(statements, route)
+                db_seconds_per_request.observe(db_seconds, route)
+                _request_db.reset(db_token)
+                current_route.reset(route_token)
+
+        return timed_handler
+
+
+# ---------- DB ----------
+
+db_statements = Counter("db_statements_total", "실행한 SQL 개수", ("route",))
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds", "SQL 한 번 실행 시간", ("route",), buckets=DB_BUCKETS
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_start"].pop()
+    route = current_route.get() or "background"
+    db_statements.inc(route)
+    db_statement_duration.observe(elapsed, route)
+    stats = _request_db.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+
+def instrument_engine(sync_engine):
+    # 비동기 엔진은 async_engine.sync_engine 을 넘김
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------- 스레드풀 ----------
+
+def _threadpool_stats():
+    # run_in_threadpool 이 쓰는 anyio 기본 limiter (이벤트 루프 안에서만 조회 가능)
+    from anyio import to_thread
+
+    try:
+        return to_thread.current_default_thread_limiter().statistics()
+    except RuntimeError:
+        return None
+
+
+def _threadpool_value(field: str) -> Callable[[], float]:
+    def value():
+        stats = _threadpool_stats()
+        return getattr(stats, field) if stats is not None else 0
+    return value
+
+
+Gauge("threadpool_threads_total", "스레드풀 최대 스레드 수", callback=_threadpool_value("total_tokens"))
+Gauge("threadpool_threads_busy", "스레드풀에서 일하고 있는 스레드 수", callback=_threadpool_value("borrowed_tokens"))
+Gauge("threadpool_tasks_waiting", "빈 스레드를 기다리는 작업 수", callback=_threadpool_value("tasks_waiting"))
+
+
+# ---------- 과일·채소 예측 ----------
+
+predict_stage_duration = Histogram(
+    "predict_stage_duration_seconds", "예측 단계별 시간 (decode / preprocess / forward)", ("stage",)
+)
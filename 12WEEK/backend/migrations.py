@@ -0,0 +1,173 @@
+# migrations.py
+# 이미 만들어진 app.db 에 새 스키마 변경사항을 반영하는 스크립트
+# create_all()은 없는 테이블만 만들고, 기존 테이블의 인덱스는 건드리지 않기 때문에 따로 처리
+# 여러 번 실행해도 결과가 같도록(idempotent) 작성
+import re
+import sys
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from db import Base, engine
+
+# 게시글 전문 검색용 FTS5 테이블 (posts 를 content 테이블로 쓰는 external content 방식)
+# posts 에 INSERT/UPDATE/DELETE 가 일어나면 트리거가 색인을 같이 갱신
+POST_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content,
+        content='posts', content_rowid='post_id',
+        tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.post_id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.post_id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+]
+
+
+# 게시글별 댓글 수 (posts.comment_count)
+# 상세 조회마다 COUNT(*) 하지 않도록 댓글 INSERT/DELETE 때 SQL 안에서 +1/-1
+# 유저 탈퇴로 댓글이 ON DELETE CASCADE 로 지워질 때도 트리거가 실행됨
+COMMENT_COUNT_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_count_ai AFTER INSERT ON comments BEGIN
+        UPDATE posts SET comment_count = coalesce(comment_count, 0) + 1 WHERE post_id = new.post_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_count_ad AFTER DELETE ON comments BEGIN
+        UPDATE posts SET comment_count = coalesce(comment_count, 0) - 1 WHERE post_id = old.post_id;
+    END
+    """,
+]
+
+
+def ensure_indexes(bind: Engine):
+    # models.py 에 선언된 인덱스 중 DB에 없는 것만 생성
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+# 외래키를 ON DELETE CASCADE 로 바꿔야 하는 테이블 (부모 → 자식 순서)
+CASCADE_TABLES = ["posts", "comments", "post_likes"]
+
+
+def _needs_cascade(conn, table: str) -> bool:
+    fks = conn.exec_driver_sql(f"PRAGMA foreign_key_list({table})").mappings().all()
+    return any(fk["on_delete"].upper() != "CASCADE" for fk in fks)
+
+
+def ensure_cascade_fks(bind: Engine):
+    # SQLite 는 ALTER TABLE 로 외래키를 바꿀 수 없어서 테이블을 새로 만들어 옮김
+    # (https://www.sqlite.org/lang_altertable.html 의 12단계 절차)
+    # 인덱스/트리거는 DROP TABLE 때 같이 사라지므로 뒤의 ensure_indexes / ensure_post_search / ensure_comment_count 가 다시 만듦
+    with bind.connect() as conn:
+        targets = [t for t in CASCADE_TABLES if inspect(conn).has_table(t) and _needs_cascade(conn, t)]
+    if not targets:
+        return
+
+    # PRAGMA foreign_keys 는 트랜잭션 밖에서만 바뀌므로 DBAPI 연결로 직접 BEGIN/COMMIT
+    raw = bind.raw_connection()
+    cur = raw.cursor()
+    try:
+        cur.execute("PRAGMA foreign_keys=OFF")
+        cur.execute("BEGIN")
+        try:
+            for table in targets:
+                create_sql = cur.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                ).fetchone()[0]
+                new_sql = re.sub(
+                    r"CREATE TABLE \"?%s\"?" % table, f"CREATE TABLE {table}__new", create_sql, count=1
+                )
+                new_sql = re.sub(
+                    r"(REFERENCES \w+ \(\w+\))(?! ON DELETE)", r"\1 ON DELETE CASCADE", new_sql
+                )
+                cur.execute(new_sql)
+                cur.execute(f"INSERT INTO {table}__new SELECT * FROM {table}")
+                cur.execute(f"DROP TABLE {table}")
+                cur.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+            # 예전에 외래키 검사 없이 남은 고아 행(부모가 없는 댓글/좋아요)은 정리
+            for table, rowid, _, _ in cur.execute("PRAGMA foreign_key_check").fetchall():
+                cur.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+    finally:
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+        raw.close()
+
+
+def rebuild_post_search(bind: Engine):
+    # posts 테이블 전체를 다시 읽어서 검색 색인을 새로 만듦
+    with bind.begin() as conn:
+        conn.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+
+
+def ensure_post_search(bind: Engine):
+    is_new = not inspect(bind).has_table("posts_fts")
+    with bind.begin() as conn:
+        for ddl in POST_SEARCH_DDL:
+            conn.execute(text(ddl))
+    if is_new:
+        # 기존 DB에 처음 붙이는 경우 이미 있는 게시글도 색인
+        rebuild_post_search(bind)
+
+
+def backfill_comment_count(bind: Engine):
+    with bind.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE posts SET comment_count = "
+                "(SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.post_id)"
+            )
+        )
+
+
+def ensure_comment_count(bind: Engine):
+    columns = {c["name"] for c in inspect(bind).get_columns("posts")}
+    with bind.begin() as conn:
+        if "comment_count" not in columns:
+            conn.execute(text("ALTER TABLE posts ADD COLUMN comment_count INTEGER DEFAULT 0"))
+        for ddl in COMMENT_COUNT_DDL:
+            conn.execute(text(ddl))
+    if "comment_count" not in columns:
+        # 기존 DB에 컬럼을 처음 추가한 경우 이미 있는 댓글 수를 채움
+        backfill_comment_count(bind)
+
+
+def run_migrations(bind: Engine = engine):
+    import models  # noqa: F401  (테이블 메타데이터 등록용)
+
+    Base.metadata.create_all(bind=bind)
+    ensure_cascade_fks(bind)
+    ensure_indexes(bind)
+    ensure_post_search(bind)
+    ensure_comment_count(bind)
+
+
+if __name__ == "__main__":
+    # python migrations.py                  → 스키마/인덱스/검색 테이블 반영
+    # python migrations.py --rebuild-search → 검색 색인 재생성
+    run_migrations()
+    if "--rebuild-search" in sys.argv:
+        rebuild_post_search(engine)
+        print("검색 색인 재생성 완료")
+    print("migration 완료")
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional, List
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from db import Base
@@ -18,34 +18,79 @@ class User(Base):
     profile_image = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    posts = relationship("Post", back_populates="user", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
+    # 실제 삭제는 DB 의 ON DELETE CASCADE 가 처리 (passive_deletes → 자식 행을 세션으로 로딩하지 않음)
+    posts = relationship("Post", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    likes = relationship("PostLike", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Post(Base):
     __tablename__ = "posts"
 
     post_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     image = Column(String, nullable=True)
     like_count = Column(Integer, default=0)
     view_count = Column(Integer, default=0)
+    comment_count = Column(Integer, default=0)  # comments INSERT/DELETE 트리거가 갱신 (migrations.py)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="posts")
-    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    comments = relationship(
+        "Comment",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Comment.comment_id",
+    )
+    likes = relationship("PostLike", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # 게시글별 댓글 조회(post_id = ? ORDER BY comment_id)용 복합 인덱스
+        # post_id 단독 조회도 이 인덱스의 앞부분으로 처리됨
+        Index("ix_comments_post_id_comment_id", "post_id", "comment_id"),
+    )
 
     comment_id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, ForeignKey("posts.post_id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     post = relationship("Post", back_populates="comments")
     user = relationship("User", back_populates="comments")
+
+
+class PostLike(Base):
+    __tablename__ = "post_likes"
+    __table_args__ = (
+        # 한 유저는 한 게시글에 좋아요를 한 번만 누를 수 있음
+        UniqueConstraint("user_id", "post_id", name="uq_post_likes_user_id_post_id"),
+    )
+
+    like_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    user = relationship("User", back_populates="likes")
+    post = relationship("Post", back_populates="likes")
+
+
+class ImageVariant(Base):
+    # 업로드 이미지의 리사이즈 버전 (thumbnails.py 에서 백그라운드로 생성)
+    __tablename__ = "image_variants"
+    __table_args__ = (
+        UniqueConstraint("source", "width", name="uq_image_variants_source_width"),
+    )
+
+    variant_id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)   # 원본 경로 (posts.image / users.profile_image 값 그대로)
+    width = Column(Integer, nullable=False)
+    url = Column(String, nullable=False)      # /media/variants/...
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,76 @@
+# passwords.py
+# 비밀번호 해시 (표준 라이브러리 scrypt)
+# scrypt 한 번에 50~100ms 정도 CPU 를 쓰기 때문에 이벤트 루프에서 바로 돌리면 다른 요청이 전부 멈춤
+# → 크기가 정해진 전용 스레드 풀에서 실행 (hashlib.scrypt 는 계산 중 GIL 을 놓음)
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+# 비용 파라미터 (바꾸면 다음 로그인 때 자동으로 새 파라미터로 다시 해시됨)
+SCRYPT_N = int(os.getenv("SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+SALT_BYTES = 16
+HASH_BYTES = 32
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))  # 동시에 해시를 계산할 최대 개수
+
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * r * (n + p),
+        dklen=HASH_BYTES,
+    )
+
+
+def hash_password(password: str) -> str:
+    # 저장 형식: scrypt$N$r$p$salt$hash
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password: str, stored: str) -> Tuple[bool, bool]:
+    # (일치 여부, 다시 해시해야 하는지) 반환
+    if not stored.startswith("scrypt$"):
+        # 해시 도입 전에 평문으로 저장된 계정 → 맞으면 바로 해시로 교체
+        ok = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return ok, ok
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        salt = base64.b64decode(salt)
+        digest = base64.b64decode(digest)
+    except ValueError:
+        return False, False
+
+    ok = hmac.compare_digest(_scrypt(password, salt, n, r, p), digest)
+    needs_rehash = ok and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return ok, needs_rehash
+
+
+# ---------- 라우트/컨트롤러에서 쓰는 비동기 버전 ----------
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> Tuple[bool, bool]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_password, password, stored)
@@ -0,0 +1,150 @@
+# profiler.py
+# 느린 요청 하나를 골라서 샘플링 프로파일 (collapsed stack 형식)
+# - 켜는 방법: PROFILER_ENABLED=1 (꺼져 있으면 미들웨어 자체를 등록하지 않음 → 비용 0)
+# - 어떤 요청을?
+#   - 관리자(ADMIN_USER_IDS) 토큰 + "X-Debug-Profile: 1" 헤더가 붙은 요청
+#   - PROFILE_SAMPLE_RATE 비율만큼 무작위 요청 (예: 0.001 → 천 개 중 하나)
+# - 요청을 처리하는 동안 별도 스레드가 PROFILE_INTERVAL 마다 모든 스레드의 스택을 찍음
+#   (이벤트 루프 스레드 + run_in_threadpool 스레드까지 보이도록, 루트 프레임은 스레드 이름)
+#   → 같은 시간에 처리 중이던 다른 요청도 섞여 보일 수 있음
+# - 결과는 PROFILE_DIR/{시각}-{id}-{METHOD}-{경로}.folded 로 저장, 응답 헤더 X-Profile-Id 로 알려줌
+#   flamegraph.pl 이나 https://www.speedscope.app 에 그대로 넣으면 flamegraph 로 볼 수 있음
+# - 다운로드: GET /admin/profiles (목록), GET /admin/profiles/{profile_id} (관리자만)
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from auth import ADMIN_USER_IDS, peek_user_id
+
+BASE_DIR = Path(__file__).resolve().parent
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))  # 초, 5ms 마다 한 번
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))  # 이보다 많으면 오래된 것부터 삭제
+PROFILE_HEADER = "x-debug-profile"
+
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+class StackSampler:
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()  # "스레드;파일:함수:줄;..." -> 횟수
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _sample(self, own: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        # 시작하자마자 한 번 찍음 → interval 보다 짧게 끝난 요청도 빈 파일이 되지 않음
+        own = threading.get_ident()
+        self._sample(own)
+        while not self._stop.wait(self.interval):
+            self._sample(own)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _slug(path: str) -> str:
+    return re.sub(r"[^\w.-]+", "-", path).strip("-")[:80]
+
+
+def save_profile(sampler: StackSampler, profile_id: str, method: str, path: str) -> str:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{profile_id}-{method}-{_slug(path)}.folded"
+    (PROFILE_DIR / name).write_text(sampler.collapsed(), encoding="utf-8")
+
+    # 파일 이름이 시각으로 시작하므로 이름순 = 오래된 순
+    for old in sorted(PROFILE_DIR.glob("*.folded"))[:-PROFILE_KEEP]:
+        old.unlink(missing_ok=True)
+    return name
+
+
+def list_profiles() -> List[dict]:
+    if not PROFILE_DIR.is_dir():
+        return []
+    return [
+        {"profile_id": p.name.split("-")[1], "name": p.name, "size": p.stat().st_size}
+        for p in sorted(PROFILE_DIR.glob("*.folded"), reverse=True)
+    ]
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    # id 형식을 검사해서 PROFILE_DIR 밖의 파일은 열 수 없게 함
+    if not PROFILE_ID_RE.match(profile_id) or not PROFILE_DIR.is_dir():
+        return None
+    return next(PROFILE_DIR.glob(f"*-{profile_id}-*.folded"), None)
+
+
+class ProfilerMiddleware:
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+        # 모든 스레드를 찍기 때문에 한 번에 하나만 (진행 중이면 그 요청은 프로파일 없이 처리)
+        self._busy = threading.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER) != "1":
+            return False
+        authorization = headers.get("authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return False
+        return peek_user_id(authorization[7:]) in ADMIN_USER_IDS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            try:
+                await run_in_threadpool(save_profile, sampler, profile_id, scope["method"], scope["path"])
+            except OSError as e:
+                print("[WARN] 프로파일 저장 실패:", e)
+            finally:
+                self._busy.release()
@@ -0,0 +1,203 @@
+# ratelimit.py
+# 비싼 라우트(로그인 / 이미지 업로드 / 과일·채소 예측) 요청 수 제한 (토큰 버킷)
+# - 라우트마다 "요청 수/초" 정책: 버킷 크기만큼 한 번에 보낼 수 있고, 이후로는 일정 속도로 다시 채워짐
+# - 키: 로그인한 유저면 user_id (Authorization 토큰), 아니면 클라이언트 IP
+# - 버킷이 비면 429 + Retry-After (다시 보낼 수 있을 때까지 남은 초)
+# - 저장소는 RATE_LIMIT_BACKEND 로 선택
+#   - memory: 프로세스 안 dict (uvicorn 워커 하나일 때)
+#   - sqlite: 같은 서버의 여러 워커가 RATE_LIMIT_SQLITE_PATH 파일 하나를 공유 (로컬/테스트용 공유 저장소)
+#   - redis:  여러 서버가 RATE_LIMIT_REDIS_URL 을 공유 (redis 패키지 필요)
+# - 공유 저장소에 문제가 생기면 요청을 막지 않고 통과시킴 (rate limit 때문에 서비스 전체가 죽지 않게)
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from auth import peek_user_id
+from responses import FastJSONResponse
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"  # 부하 테스트 때 0 으로 끄기
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "./ratelimit.db")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "0") == "1"  # 프록시 뒤면 X-Forwarded-For 사용
+RATE_LIMIT_MAX_KEYS = 100000  # memory 백엔드가 들고 있는 버킷 최대 개수
+
+
+class RatePolicy:
+    # "10/60" → 60초에 10번 (한 번에 10번까지 몰아서 가능, 이후 6초마다 1번씩 회복)
+    def __init__(self, name: str, spec: str):
+        capacity, period = spec.split("/")
+        self.name = name
+        self.capacity = float(capacity)
+        self.rate = self.capacity / float(period)  # 초당 회복되는 토큰 수
+
+
+# (method, path) → 정책
+RATE_LIMIT_POLICIES: Dict[Tuple[str, str], RatePolicy] = {
+    ("POST", "/users/login"): RatePolicy("login", os.getenv("RATE_LIMIT_LOGIN", "10/60")),
+    ("POST", "/upload/image"): RatePolicy("upload", os.getenv("RATE_LIMIT_UPLOAD", "30/60")),
+    ("POST", "/predict-fruit-veg"): RatePolicy("predict", os.getenv("RATE_LIMIT_PREDICT", "20/60")),
+}
+
+
+def _take(tokens: float, updated: float, now: float, policy: RatePolicy) -> Tuple[float, float]:
+    # 지난 시간만큼 채운 뒤 1개 사용 → (남은 토큰, 기다려야 하는 초). 0초면 통과
+    tokens = min(policy.capacity, tokens + (now - updated) * policy.rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / policy.rate
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (tokens, 갱신 시각)
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (policy.capacity, now))
+            tokens, retry_after = _take(tokens, updated, now, policy)
+            self._buckets[key] = (tokens, now)
+            # 오래 안 쓴 키부터 버림 (버린 키는 다음 요청 때 가득 찬 버킷으로 다시 시작)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SQLiteBackend:
+    # 여러 프로세스가 같은 파일을 씀 → 프로세스마다 다른 monotonic 대신 time.time() 사용
+    def __init__(self, path: str = RATE_LIMIT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # 재시작 때 버킷이 조금 틀어져도 상관없음
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _acquire(self, key: str, policy: RatePolicy) -> float:
+        conn = self._conn()
+        now = time.time()
+        # BEGIN IMMEDIATE: 읽기~쓰기 사이에 다른 워커가 끼어들지 못하게 처음부터 write lock
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (policy.capacity, now)
+            tokens, retry_after = _take(tokens, updated, now, policy)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        return await run_in_threadpool(self._acquire, key, policy)
+
+
+# 읽고 → 채우고 → 쓰기를 Redis 안에서 한 번에 (워커끼리 경쟁 없음)
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisBackend:
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self._script = self.client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        result = await self._script(
+            keys=[f"ratelimit:{key}"], args=[policy.capacity, policy.rate, time.time()]
+        )
+        return float(result)
+
+
+def create_backend():
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBackend()
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend()
+    return MemoryBackend()
+
+
+class RateLimitMiddleware:
+    # 정책이 없는 라우트는 그대로 통과 (딕셔너리 조회 한 번)
+    def __init__(self, app, policies: Dict[Tuple[str, str], RatePolicy] = None, backend=None):
+        self.app = app
+        self.policies = RATE_LIMIT_POLICIES if policies is None else policies
+        self.backend = backend or create_backend()
+
+    def _client_key(self, scope) -> str:
+        headers = Headers(scope=scope)
+        authorization = headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            user_id = peek_user_id(authorization[7:])
+            if user_id is not None:
+                return f"user:{user_id}"
+        if RATE_LIMIT_TRUST_PROXY and "x-forwarded-for" in headers:
+            return "ip:" + headers["x-forwarded-for"].split(",")[0].strip()
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        policy: Optional[RatePolicy] = None
+        if scope["type"] == "http" and RATE_LIMIT_ENABLED:
+            policy = self.policies.get((scope["method"], scope["path"]))
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            retry_after = await self.backend.acquire(f"{policy.name}:{self._client_key(scope)}", policy)
+        except Exception as e:
+            print("[WARN] rate limit 저장소 오류, 제한 없이 통과:", e)
+            retry_after = 0.0
+
+        if retry_after > 0:
+            response = FastJSONResponse(
+                {"detail": "too_many_requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,154 @@
+# replicas.py
+# 읽기 전용 레플리카 라우팅
+# - 목록/상세/프로필 조회(GET)는 레플리카 풀로, 쓰기는 항상 primary(db.py)로
+# - 방금 쓴 유저는 READ_YOUR_WRITES_SECONDS 동안 primary 에서 읽어서 자기 글이 바로 보이도록 함
+# - 같은 시간 동안은 레플리카에서 읽은 응답을 캐시(cache.py)에 넣지 않음
+#   (아직 반영 전인 레플리카 결과가 캐시에 들어가면 방금 쓴 유저도 캐시에서 옛날 내용을 보게 됨)
+# - 로컬/테스트에서는 primary 파일을 주기적으로 복사한 SQLite 파일을 레플리카로 사용 (ReplicaSyncer)
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, List, Optional
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from auth import peek_user_id
+from db import AsyncSessionLocal, DATABASE_URL, apply_sqlite_pragmas
+
+# 예: READ_REPLICA_URLS="sqlite+aiosqlite:///./replica1.db,sqlite+aiosqlite:///./replica2.db"
+READ_REPLICA_URLS = [u for u in os.getenv("READ_REPLICA_URLS", "").split(",") if u]
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_SYNC_INTERVAL = float(os.getenv("REPLICA_SYNC_INTERVAL", "0"))  # 0 이면 동기화 스레드 사용 안 함
+
+
+def _make_replica_session(url: str):
+    replica_engine = create_async_engine(url)
+    event.listen(
+        replica_engine.sync_engine,
+        "connect",
+        lambda dbapi_conn, connection_record: apply_sqlite_pragmas(dbapi_conn),
+    )
+    return async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+
+
+replica_sessions: List[async_sessionmaker] = [_make_replica_session(u) for u in READ_REPLICA_URLS]
+_replica_cycle = itertools.cycle(replica_sessions) if replica_sessions else None
+
+# user_id -> 마지막으로 쓰기를 한 시각 (오래된 쓰기부터 순서대로)
+_recent_writes: "OrderedDict[int, float]" = OrderedDict()
+_recent_writes_lock = threading.Lock()
+_last_write_at = float("-inf")  # 유저 상관없이 마지막 쓰기 시각
+
+
+def mark_write(user_id: int):
+    global _last_write_at
+    if not replica_sessions:
+        return
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes.pop(user_id, None)
+        _last_write_at = _recent_writes[user_id] = now
+        # 맨 앞(가장 오래된 쓰기)부터 만료된 유저 정리 → 다시 읽지 않는 유저가 많아도 계속 쌓이지 않음
+        # (방금 넣은 유저가 맨 뒤에 있으므로 반드시 멈춤)
+        while True:
+            oldest, written_at = next(iter(_recent_writes.items()))
+            if now - written_at <= READ_YOUR_WRITES_SECONDS:
+                break
+            del _recent_writes[oldest]
+
+
+def _wrote_recently(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    with _recent_writes_lock:
+        written_at = _recent_writes.get(user_id)
+        if written_at is None:
+            return False
+        if time.monotonic() - written_at > READ_YOUR_WRITES_SECONDS:
+            del _recent_writes[user_id]
+            return False
+        return True
+
+
+optional_security = HTTPBearer(auto_error=False)
+
+
+def _user_id_from_token(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
+    return peek_user_id(credentials.credentials if credentials else None)
+
+
+async def get_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> AsyncGenerator[AsyncSession, None]:
+    session_factory = AsyncSessionLocal
+    if replica_sessions and not (_recent_writes and _wrote_recently(_user_id_from_token(credentials))):
+        session_factory = next(_replica_cycle)
+
+    async with session_factory() as db:
+        db.info["replica"] = session_factory is not AsyncSessionLocal
+        yield db
+
+
+def cacheable_read(db: AsyncSession) -> bool:
+    # primary 에서 읽은 결과는 항상 캐시 가능
+    # 레플리카는 최근 READ_YOUR_WRITES_SECONDS 안에 쓰기가 있었으면 아직 반영 전일 수 있어서 캐시하지 않음
+    if not db.info.get("replica"):
+        return True
+    return time.monotonic() - _last_write_at > READ_YOUR_WRITES_SECONDS
+
+
+# ---------- 로컬 레플리카 동기화 ----------
+
+def _sqlite_path(url: str) -> str:
+    return make_url(url).database
+
+
+def sync_replicas():
+    # primary 파일을 SQLite backup API 로 레플리카 파일에 통째로 복사
+    src = sqlite3.connect(_sqlite_path(DATABASE_URL))
+    try:
+        for url in READ_REPLICA_URLS:
+            dst = sqlite3.connect(_sqlite_path(url))
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+    finally:
+        src.close()
+
+
+class ReplicaSyncer:
+    def __init__(self, interval: float = REPLICA_SYNC_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                sync_replicas()
+            except Exception as e:
+                print("[WARN] 레플리카 동기화 실패:", e)
+
+    def start(self):
+        if self.interval <= 0 or not READ_REPLICA_URLS or self._thread is not None:
+            return
+        sync_replicas()
+        self._thread = threading.Thread(target=self._run, name="replica-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+replica_syncer = ReplicaSyncer()
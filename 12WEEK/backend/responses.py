@@ -0,0 +1,27 @@
+# responses.py
+# 빠른 JSON 직렬화 경로
+# - orjson 이 설치되어 있으면 orjson 으로, 없으면 표준 json 으로 직렬화
+# - 컨트롤러가 만든 dict 를 FastJSONResponse 로 바로 감싸서 반환하면
+#   FastAPI 의 response_model 검증 + jsonable_encoder 를 건너뜀 (response_model 은 문서용)
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson 없는 환경에서도 동작
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
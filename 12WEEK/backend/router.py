@@ -4,20 +4,34 @@ import json
 import numpy as np
 import os
 from typing import Optional, List, Dict
-import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Query, Depends, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Query, Depends, UploadFile, File, Form, HTTPException, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from auth import get_current_user
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from auth import get_admin_user, get_current_user
+from cache import FEED_TAG, post_tag, response_cache, user_tag
+from counters import view_counter
 
 from PIL import Image
 import torch
 import torch.nn as nn
 from torchvision import models, transforms
 
-from db import get_db
+from db import AsyncSessionLocal, get_async_db
+from export import agzip_stream, aiter_export
+from metrics import MetricsRoute, predict_stage_duration
+from passwords import hash_password_async
+from profiler import list_profiles, profile_path
+from replicas import cacheable_read, get_read_db
+from responses import FastJSONResponse, dumps
+from thumbnails import schedule_variants
+from storage import storage
+from slowlog import slow_query_log
+from schemas import CommentListResponse, PostDetailResponse, PostListResponse, UserProfileResponse
 from models import User
 from controllers import (
     SignupRequest,
@@ -33,12 +47,17 @@ from controllers import (
     get_profile_controller,
     update_profile_controller,
     update_password_controller,
+    delete_user_controller,
     create_post_controller,
     list_posts_controller,
+    batch_posts_controller,
+    search_posts_controller,
     post_detail_controller,
     update_post_controller,
     delete_post_controller,
     create_comment_controller,
+    list_comments_controller,
+    create_comments_batch_controller,
     update_comment_controller,
     ToggleLikeRequest,
     toggle_like_controller
@@ -47,8 +66,6 @@ from controllers import (
 # ----- 경로 설정 -----
 BASE_DIR = Path(__file__).resolve().parent        # backend/
 MEDIA_DIR = BASE_DIR / "media"
-UPLOAD_DIR = MEDIA_DIR / "post_images"            # 게시글용 이미지 폴더
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 MODEL_PATH = os.path.join(BASE_DIR, "fruit_veg_resnet18.pt")
 LABEL_PATH = os.path.join(BASE_DIR, "class_indices.json")
 
@@ -85,18 +102,22 @@ preprocess_tf = transforms.Compose([
 ])
 
 def preprocess_image(image_bytes: bytes):
-    try:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    except Exception:
-        raise HTTPException(status_code=400, detail="업로드된 파일을 이미지로 열 수 없습니다.")
-    image = preprocess_tf(image)
-    return image.unsqueeze(0)
+    # 단계별 시간은 /metrics 의 predict_stage_duration_seconds 로 확인
+    with predict_stage_duration.time("decode"):
+        try:
+            image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        except Exception:
+            raise HTTPException(status_code=400, detail="업로드된 파일을 이미지로 열 수 없습니다.")
+    with predict_stage_duration.time("preprocess"):
+        image = preprocess_tf(image)
+        return image.unsqueeze(0)
 
 class PredictionResponse(BaseModel):
     top1_label: str
     top1_score: float
     probabilities: Dict[str, float]
-router = APIRouter()
+# 라우트별 응답 시간 / 처리 중 요청 수 / SQL 개수 기록 (metrics.py)
+router = APIRouter(default_response_class=FastJSONResponse, route_class=MetricsRoute)
 
 
 # ========== 유저 ==========
@@ -106,69 +127,73 @@ async def signup(
     password: str = Form(...),
     nickname: str = Form(...),
     profile_image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # 이메일/닉네임 중복 체크
-    existing_email = db.query(User).filter(User.email == email).first()
+    existing_email = await db.scalar(select(User.user_id).where(User.email == email))
     if existing_email:
       raise HTTPException(status_code=400, detail="이메일이 중복되었습니다")
 
-    existing_nick = db.query(User).filter(User.nickname == nickname).first()
+    existing_nick = await db.scalar(select(User.user_id).where(User.nickname == nickname))
     if existing_nick:
       raise HTTPException(status_code=400, detail="닉네임이 중복되었습니다")
 
-    # 프로필 이미지 저장
-    file_path = None
-    if profile_image:
-        save_dir = "media/profile"
-        os.makedirs(save_dir, exist_ok=True)
-        file_path = f"{save_dir}/{profile_image.filename}"
-        with open(file_path, "wb") as f:
-            f.write(await profile_image.read())
+    # 프로필 이미지 저장 (storage.py, 키는 내용 해시라 다른 유저 파일과 겹치지 않음)
+    profile_key = None
+    if profile_image and profile_image.filename:
+        profile_key = await storage.save(profile_image, "profile")
 
     user = User(
         email=email,
-        password=password,   # 실제 서비스면 해시해야 함
+        password=await hash_password_async(password),
         nickname=nickname,
-        profile_image=file_path,
+        profile_image=storage.url(profile_key) if profile_key else None,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    schedule_variants(profile_key)
 
     return {"message": "register_success", "data": {"user_id": user.user_id}}
 
 
 @router.post("/users/login")
-def login(body: LoginRequest, db: Session = Depends(get_db)):
-    return login_controller(db, body)
+async def login(body: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    return await login_controller(db, body)
 
 
-@router.get("/users/me")
-def get_profile(
-    db: Session = Depends(get_db),
+@router.get("/users/me", response_model=UserProfileResponse)
+async def get_profile(
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user),
 ):
-    return get_profile_controller(db, current_user.user_id)
+    return FastJSONResponse(await get_profile_controller(db, current_user.user_id))
 
 
 
 @router.patch("/users/me")
-def update_profile(
+async def update_profile(
     body: UpdateProfileRequest,
     user_id: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return update_profile_controller(db, body, user_id=user_id)
+    return await update_profile_controller(db, body, user_id=user_id)
 
 
 @router.patch("/users/me/password")
-def update_password(
+async def update_password(
     body: UpdatePasswordRequest,
     user_id: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return update_password_controller(db, body, user_id=user_id)
+    return await update_password_controller(db, body, user_id=user_id)
+
+
+@router.delete("/users/me")
+async def delete_user(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    return await delete_user_controller(db, current_user.user_id)
 
 
 # ========== 게시글 ==========
@@ -178,92 +203,158 @@ async def upload_image(file: UploadFile = File(...)):
     if not file:
         raise HTTPException(status_code=400, detail="no_file")
 
-    ext = Path(file.filename).suffix or ".jpg"
-    filename = f"{uuid.uuid4().hex}{ext}"
-    filepath = UPLOAD_DIR / filename
-
-    # 실제 파일 저장
-    with open(filepath, "wb") as f:
-        f.write(await file.read())
-
-    # 브라우저에서 바로 쓸 URL (main.py에서 /media 가 media/ 로 mount 됨)
-    url = f"/media/post_images/{filename}"
-    return {"url": url}
+    # 청크 단위로 스트리밍 저장, 키는 내용의 SHA-256 (storage.py)
+    # 로컬이면 /media/post_images/..., S3 면 버킷 공개 URL
+    # 같은 내용이면 항상 같은 URL → 캐시해도 안전
+    key = await storage.save(file, "post_images")
+    # 목록용 작은 이미지는 백그라운드에서 생성 (thumbnails.py, URL 이 아니라 저장소 키로 원본을 읽음)
+    schedule_variants(key)
+    return {"url": storage.url(key)}
 
 
     
 @router.post("/posts")
-def create_post(
+async def create_post(
     body: CreatePostRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return create_post_controller(db, body, user_id=current_user.user_id)
+    return await create_post_controller(db, body, user_id=current_user.user_id)
 
 
-@router.get("/posts")
-def list_posts(
+@router.get("/posts", response_model=PostListResponse)
+async def list_posts(
     cursor: Optional[int] = Query(default=None),
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return list_posts_controller(db, cursor, limit)
-
-
-@router.get("/posts/{post_id}")
-def post_detail(post_id: int, db: Session = Depends(get_db)):
-    return post_detail_controller(db, post_id)
+    # 캐시 히트 시 DB 세션은 열리기만 하고 쿼리는 나가지 않음
+    key = f"list_posts:{cursor}:{limit}"
+    body = response_cache.get(key)
+    if body is None:
+        # 읽는 도중에 무효화되면 옛날 응답을 캐시에 넣지 않도록 읽기 전 version 을 받아둠
+        since = response_cache.version()
+        result = await list_posts_controller(db, cursor, limit)
+        body = dumps(result)
+        tags = {FEED_TAG} | {user_tag(p["user_id"]) for p in result["data"]["posts"]}
+        if cacheable_read(db):
+            response_cache.set(key, body, tags, since=since)
+    # 이미 직렬화된 바이트라 다시 인코딩하지 않고 그대로 전송
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/posts:batch")
+async def batch_posts(
+    ids: str = Query(..., description="쉼표로 구분한 게시글 id 목록 (예: 1,2,3)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        post_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_ids")
+    return FastJSONResponse(await batch_posts_controller(db, post_ids))
+
+
+# /posts/{post_id} 보다 먼저 선언해야 "search" 가 post_id 로 해석되지 않음
+@router.get("/posts/search")
+async def search_posts(
+    q: str = Query(..., min_length=1),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return FastJSONResponse(await search_posts_controller(db, q, cursor, limit))
+
+
+@router.get("/posts/{post_id}", response_model=PostDetailResponse)
+async def post_detail(post_id: int, db: AsyncSession = Depends(get_read_db)):
+    key = f"post_detail:{post_id}"
+    body = response_cache.get(key)
+    if body is None:
+        since = response_cache.version()
+        result = await post_detail_controller(db, post_id)
+        body = dumps(result)
+        detail = result["data"]
+        tags = {post_tag(post_id), user_tag(detail["user_id"])}
+        tags |= {user_tag(c["user_id"]) for c in detail["comments"]}
+        if cacheable_read(db):
+            response_cache.set(key, body, tags, since=since)
+    else:
+        # 캐시 히트여도 조회수는 올라가야 함
+        view_counter.hit(post_id)
+    # 이미 직렬화된 바이트라 다시 인코딩하지 않고 그대로 전송
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/posts/{post_id}")
-def update_post(
+async def update_post(
     post_id: int,
     body: UpdatePostRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return update_post_controller(db, post_id, body, user_id=current_user.user_id)
+    return await update_post_controller(db, post_id, body, user_id=current_user.user_id)
 
 
 @router.delete("/posts/{post_id}")
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return delete_post_controller(db, post_id, user_id=current_user.user_id)
+    return await delete_post_controller(db, post_id, user_id=current_user.user_id)
 
 @router.post("/posts/{post_id}/like")
-def toggle_like(
+async def toggle_like(
     post_id: int,
     body: ToggleLikeRequest,
-    db: Session = Depends(get_db),
-    #current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
 ):
-    return toggle_like_controller(db, post_id, body.is_like)
+    return await toggle_like_controller(db, post_id, body.is_like, user_id=current_user.user_id)
 
 # ========== 댓글 ==========
 
+@router.get("/posts/{post_id}/comments", response_model=CommentListResponse)
+async def list_comments(
+    post_id: int,
+    cursor: Optional[int] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return FastJSONResponse(await list_comments_controller(db, post_id, cursor, limit))
+
 @router.post("/posts/{post_id}/comments")
-def create_comment(
+async def create_comment(
     post_id: int,
     body: CreateCommentRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return create_comment_controller(db, post_id, body, user_id=current_user.user_id)
+    return await create_comment_controller(db, post_id, body, user_id=current_user.user_id)
+
+
+
+@router.post("/posts/{post_id}/comments:batch")
+async def create_comments_batch(
+    post_id: int,
+    body: List[CreateCommentRequest],
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    return await create_comments_batch_controller(db, post_id, body, user_id=current_user.user_id)
 
 
 
 @router.patch("/posts/{post_id}/comments/{comment_id}")
-def update_comment(
+async def update_comment(
     post_id: int,
     comment_id: int,
     body: UpdateCommentRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return update_comment_controller(
+    return await update_comment_controller(
         db,              
         post_id,
         comment_id,
@@ -271,6 +362,58 @@ def update_comment(
         user_id=current_user.user_id
     )
 
+# ========== 관리자 ==========
+
+@router.get("/export/posts.ndjson")
+async def export_posts(
+    since_post_id: Optional[int] = Query(default=None),
+    gzip: bool = False,
+    admin = Depends(get_admin_user),
+):
+    # 스트리밍이 끝날 때까지 세션이 살아있어야 하므로 제너레이터 안에서 직접 열고 닫음
+    async def lines():
+        async with AsyncSessionLocal() as db:
+            async for chunk in aiter_export(db, since_post_id):
+                yield chunk
+
+    if gzip:
+        return StreamingResponse(
+            agzip_stream(lines()),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="posts.ndjson.gz"'},
+        )
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# 샘플링 프로파일 결과 (profiler.py)
+@router.get("/admin/profiles")
+async def get_profiles(admin = Depends(get_admin_user)):
+    return {"message": "get_profiles_success", "data": await run_in_threadpool(list_profiles)}
+
+
+@router.get("/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, admin = Depends(get_admin_user)):
+    path = await run_in_threadpool(profile_path, profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="profile_not_found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=path.name)
+
+
+# 느린 쿼리 / 총 시간 상위 쿼리 (slowlog.py)
+@router.get("/admin/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(default=20, ge=1, le=200),
+    admin = Depends(get_admin_user),
+):
+    return {
+        "message": "get_slow_queries_success",
+        "data": {
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "top": slow_query_log.top(limit),
+            "recent": list(slow_query_log.recent)[-limit:],
+        },
+    }
+
 # ========== 홈 화면용 이미지 업로드 ==========
 
 @router.post("/predict-fruit-veg")
@@ -287,7 +430,7 @@ async def predict_fruit_veg(file: UploadFile = File(...)):
 
     img_tensor = preprocess_image(image_bytes)
 
-    with torch.no_grad():
+    with torch.no_grad(), predict_stage_duration.time("forward"):
         preds = model(img_tensor)
         probs = torch.softmax(preds, dim=1)[0].numpy()
 
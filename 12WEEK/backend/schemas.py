@@ -15,6 +15,7 @@ class CommentCreate(CommentBase):
 class CommentRead(CommentBase):
     comment_id: int
     user_id: int
+    user_nickname: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -34,6 +35,8 @@ class PostCreate(PostBase):
 class PostRead(PostBase):
     post_id: int
     user_id: int
+    user_nickname: Optional[str] = None
+    image_thumbnail: Optional[str] = None   # 목록용 작은 이미지 (없으면 원본)
     like_count: int
     view_count: int
 
@@ -42,7 +45,10 @@ class PostRead(PostBase):
 
 
 class PostDetail(PostRead):
-    comments: List[CommentRead] = []
+    comments: List[CommentRead] = []   # 첫 페이지만
+    comment_count: int = 0
+    comments_has_next: bool = False
+    comments_next_cursor: Optional[int] = None
 
 
 # ---------- 유저 ----------
@@ -61,3 +67,45 @@ class UserRead(UserBase):
 
     class Config:
         orm_mode = True
+
+
+class UserProfile(BaseModel):
+    user_id: int
+    email: str
+    nickname: str
+    profile_image: Optional[str] = None
+
+
+# ---------- 응답 (message + data 형태) ----------
+# 라우트의 response_model 로 선언해서 API 문서에 응답 형태를 보여주는 용도
+# 실제 응답은 responses.FastJSONResponse 로 바로 직렬화 (검증 X)
+class PostListData(BaseModel):
+    posts: List[PostRead]
+    has_next: bool
+    next_cursor: Optional[int] = None
+
+
+class CommentListData(BaseModel):
+    comments: List[CommentRead]
+    has_next: bool
+    next_cursor: Optional[int] = None
+
+
+class CommentListResponse(BaseModel):
+    message: str
+    data: CommentListData
+
+
+class PostListResponse(BaseModel):
+    message: str
+    data: PostListData
+
+
+class PostDetailResponse(BaseModel):
+    message: str
+    data: PostDetail
+
+
+class UserProfileResponse(BaseModel):
+    message: str
+    data: UserProfile
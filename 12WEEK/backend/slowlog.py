@@ -0,0 +1,173 @@
+# slowlog.py
+# 느린 쿼리 로그 + 쿼리 종류(fingerprint)별 누적 시간
+# - db.py 엔진의 before/after_cursor_execute 이벤트로 모든 SQL 시간을 잼
+# - 값만 다른 같은 모양의 쿼리는 fingerprint 하나로 묶어서 횟수 / 총 시간 / 최대 시간 누적
+#   (리터럴 → ?, IN (?, ?, ...) → IN (...))
+# - SLOW_QUERY_MS 를 넘은 쿼리는 [SLOW QUERY] 로 출력하고 최근 SLOW_QUERY_KEEP 개를 보관
+#   - 바인딩 파라미터 (이름에 password/token/secret/email 이 들어가면 *** 로 가림)
+#   - 쿼리를 실행한 라우트 (metrics.current_route)
+#   - EXPLAIN QUERY PLAN 결과 (fingerprint 마다 처음 한 번만 실행)
+# - 관리자 API: GET /admin/slow-queries?limit=20 → 총 시간 기준 상위 fingerprint + 최근 느린 쿼리
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from metrics import current_route
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_KEEP = int(os.getenv("SLOW_QUERY_KEEP", "200"))
+REDACT_PARAM_NAMES = [n for n in os.getenv("REDACT_PARAM_NAMES", "password,token,secret,email").split(",") if n]
+MAX_FINGERPRINTS = 2000  # 이보다 많아지면 새 fingerprint 는 "other" 로 묶음
+MAX_PARAM_CHARS = 80
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    # SQLAlchemy 는 같은 쿼리에 같은 문자열을 쓰므로 캐시가 거의 항상 맞음
+    sql = _STRING_RE.sub("?", statement)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub(r"\1, ...", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def _redact_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_PARAM_CHARS:
+        return value[:MAX_PARAM_CHARS] + f"...({len(value)} chars)"
+    if value is None or isinstance(value, (int, float, bool, str)):
+        return value
+    return str(value)
+
+
+def redact_params(context, parameters):
+    # ORM/Core 쿼리는 파라미터 이름이 있어서 이름으로 가림, 이름을 모르는 raw SQL 은 값을 전부 가림
+    compiled = getattr(context, "compiled_parameters", None)
+    if compiled and len(compiled) == 1:
+        return {
+            name: "***" if any(s in name.lower() for s in REDACT_PARAM_NAMES) else _redact_value(value)
+            for name, value in compiled[0].items()
+        }
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"<executemany x{len(parameters)}>"
+    return ["***" for _ in parameters or ()]
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, keep: int = SLOW_QUERY_KEEP):
+        self.threshold = threshold_ms / 1000
+        self.recent = deque(maxlen=keep)
+        self._stats: Dict[str, dict] = {}  # fingerprint -> 누적 통계
+        self._lock = threading.Lock()
+
+    def _stats_for(self, fp: str) -> dict:
+        stats = self._stats.get(fp)
+        if stats is None:
+            if len(self._stats) >= MAX_FINGERPRINTS:
+                fp = "other"
+                stats = self._stats.get(fp)
+            if stats is None:
+                stats = self._stats[fp] = {
+                    "fingerprint": fp, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "slow_count": 0, "routes": set(), "plan": None,
+                }
+        return stats
+
+    def record(self, conn, statement: str, parameters, context, executemany: bool, elapsed: float):
+        fp = fingerprint(statement)
+        route = current_route.get() or "background"
+        slow = elapsed >= self.threshold
+        with self._lock:
+            stats = self._stats_for(fp)
+            stats["count"] += 1
+            stats["total_ms"] += elapsed * 1000
+            stats["max_ms"] = max(stats["max_ms"], elapsed * 1000)
+            stats["routes"].add(route)
+            if slow:
+                stats["slow_count"] += 1
+            need_plan = slow and stats["plan"] is None
+        if not slow:
+            return
+
+        if need_plan and not executemany:
+            plan = _explain(conn, statement, parameters)
+            with self._lock:
+                stats["plan"] = plan
+        entry = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ms": round(elapsed * 1000, 2),
+            "route": route,
+            "fingerprint": fp,
+            "params": redact_params(context, parameters),
+            "plan": stats["plan"],
+        }
+        self.recent.append(entry)
+        print(f"[SLOW QUERY] {entry['ms']}ms route={route} {fp} params={entry['params']}")
+
+    def top(self, limit: int = 20) -> List[dict]:
+        with self._lock:
+            rows = sorted(self._stats.values(), key=lambda s: s["total_ms"], reverse=True)[:limit]
+            return [
+                {
+                    **row,
+                    "total_ms": round(row["total_ms"], 2),
+                    "max_ms": round(row["max_ms"], 2),
+                    "avg_ms": round(row["total_ms"] / row["count"], 3),
+                    "routes": sorted(row["routes"]),
+                }
+                for row in rows
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.recent.clear()
+
+    # ---------- 엔진 이벤트 ----------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slowlog_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slowlog_start"].pop()
+        try:
+            self.record(conn, statement, parameters, context, executemany, elapsed)
+        except Exception as e:
+            # 로그 때문에 원래 쿼리가 실패하면 안 됨
+            print("[WARN] slow query 기록 실패:", e)
+
+    def attach(self, sync_engine):
+        # 비동기 엔진은 async_engine.sync_engine 을 넘김
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    # 같은 커넥션의 DBAPI 커서로 직접 실행 → 이벤트가 다시 불리지 않음 (aiosqlite 도 sync 래퍼로 동작)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"explain failed: {e}"]
+    finally:
+        cursor.close()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,286 @@
+# storage.py
+# 업로드 파일 저장소 (로컬 디스크 / S3 호환 스토리지)
+# - 파일 전체를 메모리에 올리지 않고 CHUNK_SIZE 씩 읽어서 임시 파일에 씀 (디스크 쓰기는 스레드풀)
+# - 크기 제한(MAX_UPLOAD_BYTES)은 두 군데서 검사
+#   - UploadSizeLimitMiddleware: 업로드 라우트에서 Content-Length 가 너무 크면 본문을 읽기 전에 413
+#     (Content-Length 가 없는 chunked 요청은 받은 바이트를 세다가 넘는 순간 413)
+#     FastAPI 는 핸들러 실행 전에 multipart 본문을 끝까지 파싱하므로, 이 검사가 없으면 큰 파일도 다 받은 뒤에야 거절됨
+#   - spool_upload: 파싱된 파일 하나의 실제 크기 (정확한 값 기준)
+# - 키는 "{폴더}/{내용 SHA-256}{확장자}" → 다른 유저 파일을 덮어쓸 일이 없고,
+#   같은 이미지를 다시 올려도 저장 공간을 더 쓰지 않으며 URL 이 바뀌지 않음
+# - save() 는 키를 반환, 브라우저용 URL 은 storage.url(key)
+#   썸네일(thumbnails.py)은 키로 exists / read_bytes / write_bytes 를 호출해서 백엔드와 상관없이 생성
+# - STORAGE_BACKEND 환경변수로 선택: local(기본) / s3
+#
+# S3 백엔드 설정 (MinIO 같은 로컬 S3 호환 서버로도 테스트 가능)
+#   S3_BUCKET, S3_ENDPOINT_URL(예: http://localhost:9000), S3_PUBLIC_URL(예: http://localhost:9000/bucket)
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from responses import FastJSONResponse
+
+BASE_DIR = Path(__file__).resolve().parent
+MEDIA_DIR = BASE_DIR / "media"
+
+CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))  # 기본 10MB
+MULTIPART_OVERHEAD = 64 * 1024  # multipart 경계 / 헤더 / 다른 폼 필드(회원가입 email 등) 여유분
+UPLOAD_PATHS = {"/upload/image", "/users/signup", "/predict-fruit-veg"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".jfif"}
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+
+
+def _image_ext(filename: str) -> str:
+    ext = Path(filename or "").suffix.lower()
+    return ext if ext in IMAGE_EXTENSIONS else ".jpg"
+
+
+def _remove_quietly(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def spool_upload(file: UploadFile, tmp_dir: Path, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, str]:
+    # 업로드를 임시 파일로 스트리밍하면서 SHA-256 계산 → (임시 파일 경로, 해시) 반환
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix=".upload-")
+    tmp = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail="file_too_large")
+            digest.update(chunk)
+            await run_in_threadpool(tmp.write, chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="empty_file")
+        await run_in_threadpool(tmp.close)
+        return tmp_path, digest.hexdigest()
+    except BaseException:
+        tmp.close()
+        _remove_quietly(tmp_path)
+        raise
+
+
+class UploadSizeLimitMiddleware:
+    # 업로드 라우트(POST)만 검사, 나머지는 그대로 통과
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD, paths=UPLOAD_PATHS):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def _reject(self, scope, receive, send):
+        response = FastJSONResponse({"detail": "file_too_large"}, status_code=413, headers={"Connection": "close"})
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_bytes:
+                await self._reject(scope, receive, send)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        # Content-Length 가 없으면 받은 만큼 세다가 넘으면 413 을 보내고,
+        # 앱에는 연결이 끊긴 것으로 알려서 더 읽지 않게 함 (이후 앱의 응답은 버림)
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+
+class LocalStorage:
+    # backend/media/ 아래에 저장, main.py 에서 /media 로 서빙
+    def __init__(self, root: Path = MEDIA_DIR, url_prefix: str = "/media"):
+        self.root = root
+        self.url_prefix = url_prefix
+
+    def url(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}"
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def read_bytes(self, key: str) -> bytes:
+        return (self.root / key).read_bytes()
+
+    def write_bytes(self, key: str, data: bytes):
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _finalize(self, tmp_path: str, final_path: Path):
+        if final_path.exists():
+            # 같은 내용의 파일이 이미 있음 → 임시 파일만 지움
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, final_path)
+
+    async def save(self, file: UploadFile, folder: str, max_bytes: int = MAX_UPLOAD_BYTES) -> str:
+        # 저장 후 키 반환 (URL 은 self.url(key))
+        dest_dir = self.root / folder
+        # 임시 파일을 같은 디렉토리에 만들어야 os.replace 가 원자적으로 동작
+        tmp_path, sha256 = await spool_upload(file, dest_dir, max_bytes)
+        key = f"{folder}/{sha256}{_image_ext(file.filename)}"
+        try:
+            await run_in_threadpool(self._finalize, tmp_path, self.root / key)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        return key
+
+
+class S3Storage:
+    # boto3 는 S3 백엔드를 쓸 때만 필요
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str = None,
+        public_url: str = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+    ):
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.public_url = (public_url or f"{endpoint_url}/{bucket}").rstrip("/")
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def write_bytes(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def _read_part(self, path: str, offset: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(self.part_size)
+
+    async def _upload_multipart(self, tmp_path: str, key: str, size: int):
+        # 파트를 동시에 max_concurrency 개까지 올림
+        upload = await run_in_threadpool(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=key
+        )
+        upload_id = upload["UploadId"]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def upload_part(part_number: int, offset: int):
+            async with semaphore:
+                body = await run_in_threadpool(self._read_part, tmp_path, offset)
+                result = await run_in_threadpool(
+                    self.client.upload_part,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": result["ETag"]}
+
+        try:
+            parts = await asyncio.gather(
+                *[
+                    upload_part(i + 1, offset)
+                    for i, offset in enumerate(range(0, size, self.part_size))
+                ]
+            )
+            await run_in_threadpool(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await run_in_threadpool(
+                self.client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+            raise
+
+    async def save(self, file: UploadFile, folder: str, max_bytes: int = MAX_UPLOAD_BYTES) -> str:
+        tmp_path, sha256 = await spool_upload(file, Path(tempfile.gettempdir()), max_bytes)
+        key = f"{folder}/{sha256}{_image_ext(file.filename)}"
+        try:
+            if not await run_in_threadpool(self.exists, key):
+                size = os.path.getsize(tmp_path)
+                if size > self.part_size:
+                    await self._upload_multipart(tmp_path, key, size)
+                else:
+                    body = await run_in_threadpool(Path(tmp_path).read_bytes)
+                    await run_in_threadpool(
+                        self.client.put_object, Bucket=self.bucket, Key=key, Body=body
+                    )
+        finally:
+            _remove_quietly(tmp_path)
+        return key
+
+
+def create_storage():
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=os.environ["S3_BUCKET"],
+            endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+            public_url=os.getenv("S3_PUBLIC_URL"),
+            part_size=int(os.getenv("S3_PART_SIZE", str(8 * 1024 * 1024))),
+            max_concurrency=int(os.getenv("S3_MAX_CONCURRENCY", "4")),
+        )
+    return LocalStorage()
+
+
+storage = create_storage()
@@ -0,0 +1,70 @@
+# tests/conftest.py
+# 테스트 공통 설정
+# - db.py 는 현재 폴더의 ./app.db 를 쓰므로, 다른 모듈을 import 하기 전에 임시 폴더로 이동
+#   → 실제 app.db 를 건드리지 않음
+# - 비동기 테스트는 anyio 플러그인 (@pytest.mark.anyio) 사용
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(tempfile.mkdtemp(prefix="ktb-test-"))
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")  # API 테스트에서는 끔, 제한 자체는 test_ratelimit.py 에서 켜고 확인
+
+from auth import create_access_token  # noqa: E402
+from db import SessionLocal  # noqa: E402
+from migrations import run_migrations  # noqa: E402
+from models import Comment, Post, User  # noqa: E402
+
+run_migrations()
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_user() -> int:
+    n = next(_ids)
+    with SessionLocal() as db:
+        user = User(email=f"user{n}@test.com", password="pw", nickname=f"user{n}")
+        db.add(user)
+        db.commit()
+        return user.user_id
+
+
+def make_post(user_id: int, comments: int = 0, commenter_ids=None) -> int:
+    # 댓글 작성자는 commenter_ids 를 돌아가며 사용 (없으면 글쓴이)
+    commenter_ids = commenter_ids or [user_id]
+    with SessionLocal() as db:
+        post = Post(user_id=user_id, title="title", content="content")
+        db.add(post)
+        db.flush()
+        db.add_all(
+            Comment(post_id=post.post_id, user_id=commenter_ids[i % len(commenter_ids)], content=f"c{i}")
+            for i in range(comments)
+        )
+        db.commit()
+        return post.post_id
+
+
+def auth_header(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+
+@pytest.fixture
+async def client():
+    # 라우터가 torch 모델을 로딩하므로 API 테스트에서만 main 을 import
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
@@ -0,0 +1,51 @@
+# tests/test_comments.py
+# 댓글 여러 개 한 번에 작성: 응답의 comment_id 와 content 가 실제로 저장된 행과 짝이 맞는지
+import pytest
+from sqlalchemy import select
+
+from conftest import auth_header, make_post, make_user
+from db import SessionLocal
+from models import Comment, Post
+
+
+@pytest.mark.anyio
+async def test_batch_comment_ids_match_contents(client):
+    user = make_user()
+    post_id = make_post(user)
+    contents = [f"batch comment {i}" for i in range(50)]
+
+    response = await client.post(
+        f"/posts/{post_id}/comments:batch",
+        json=[{"content": c} for c in contents],
+        headers=auth_header(user),
+    )
+    assert response.status_code == 200
+    created = response.json()["data"]["comments"]
+    assert [c["content"] for c in created] == contents
+
+    with SessionLocal() as db:
+        stored = dict(db.execute(select(Comment.comment_id, Comment.content).where(Comment.post_id == post_id)).all())
+    assert {c["comment_id"]: c["content"] for c in created} == stored
+
+
+@pytest.mark.anyio
+async def test_comment_count_follows_inserts_and_cascade_deletes(client):
+    author = make_user()
+    commenter = make_user()
+    post_id = make_post(author, comments=3, commenter_ids=[author])
+
+    await client.post(f"/posts/{post_id}/comments", json={"content": "one"}, headers=auth_header(commenter))
+    await client.post(
+        f"/posts/{post_id}/comments:batch",
+        json=[{"content": "two"}, {"content": "three"}],
+        headers=auth_header(commenter),
+    )
+    detail = (await client.get(f"/posts/{post_id}")).json()["data"]
+    assert detail["comment_count"] == 6
+
+    # 탈퇴하면 댓글은 ON DELETE CASCADE 로 지워지고 트리거가 댓글 수도 줄임
+    response = await client.delete("/users/me", headers=auth_header(commenter))
+    assert response.status_code == 200
+    with SessionLocal() as db:
+        comment_count = db.scalar(select(Post.comment_count).where(Post.post_id == post_id))
+    assert comment_count == 3
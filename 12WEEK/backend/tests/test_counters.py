@@ -0,0 +1,78 @@
+# tests/test_counters.py
+# 조회수 버퍼: flush 가 실패해도 증가분이 사라지거나 두 번 세지지 않고, 다음 flush 때 반영되는지
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+import counters
+from conftest import make_post, make_user
+from counters import ViewCounter
+from db import SessionLocal
+from models import Post
+
+
+def _view_count(post_id: int) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(Post.view_count).where(Post.post_id == post_id)) or 0
+
+
+class CheckedLock:
+    # lock 을 놓을 때마다 버퍼(_pending + _flushing)의 합이 지금까지의 조회 수와 같은지 기록
+    def __init__(self, counter: ViewCounter, lock):
+        self.counter = counter
+        self.lock = lock
+        self.hits = 0
+        self.totals = []
+
+    def __enter__(self):
+        self.lock.__enter__()
+
+    def __exit__(self, *exc):
+        buffered = sum(self.counter._pending.values()) + sum(self.counter._flushing.values())
+        self.totals.append((buffered, self.hits))
+        return self.lock.__exit__(*exc)
+
+
+def test_failed_flush_keeps_views_for_next_flush(monkeypatch, capsys):
+    post_id = make_post(make_user())
+    counter = ViewCounter()
+    checked = counter._lock = CheckedLock(counter, counter._lock)
+    checked.hits = 3
+    counter.hit(post_id, 3)
+    seen = {}
+
+    class FailingSession:
+        # UPDATE 도중 (증가분이 _flushing 에 있는 동안) 새 조회가 들어오고, UPDATE 는 실패
+        def execute(self, stmt):
+            checked.hits += 1
+            counter.hit(post_id)
+            seen["pending"] = counter.pending(post_id)
+            seen["depth"] = counter.depth()
+            raise OperationalError("UPDATE posts", {}, Exception("database is locked"))
+
+        def commit(self):
+            pytest.fail("commit after failed execute")
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(counters, "SessionLocal", FailingSession)
+    assert counter.flush() == 0
+    assert "[WARN] 조회수 flush 실패" in capsys.readouterr().out
+
+    # flush 중에도, 실패 후에도 3 + 1 (두 번 세거나 잃어버리지 않음)
+    assert seen == {"pending": 4, "depth": 1}
+    assert counter.pending(post_id) == 4
+    assert counter.depth() == 4
+    assert counter._flushing == {}
+    # 중간에 lock 을 놓은 어느 순간에도 버퍼 합계 == 실제 조회 수 (되돌린 batch 가 _flushing 에도 남아 있지 않음)
+    assert all(buffered == hits for buffered, hits in checked.totals)
+
+    monkeypatch.undo()
+    assert counter.flush() == 1
+    assert _view_count(post_id) == 4
+    assert counter.pending(post_id) == 0
+    assert counter.depth() == 0
@@ -0,0 +1,59 @@
+# tests/test_export.py
+# NDJSON 내보내기: 댓글을 여러 번에 나눠 받아도 게시글 줄이 올바르게 만들어지는지
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+import export
+from conftest import make_post, make_user
+from db import AsyncSessionLocal, SessionLocal
+from models import Comment, Post
+
+
+def _setup(monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 2)
+    with SessionLocal() as db:
+        since = db.scalar(select(func.max(Post.post_id))) or 0
+    user = make_user()
+    # 청크(2개)보다 댓글이 많은 게시글 / 댓글 없는 게시글 / 1개인 게시글
+    post_ids = [make_post(user, comments=n) for n in (7, 0, 1, 5, 0)]
+    return since, post_ids
+
+
+def _expected(post_ids):
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(Comment.post_id, Comment.comment_id, Comment.content)
+            .where(Comment.post_id.in_(post_ids))
+            .order_by(Comment.post_id, Comment.comment_id)
+        ).all()
+    expected = {post_id: [] for post_id in post_ids}
+    for post_id, comment_id, content in rows:
+        expected[post_id].append((comment_id, content))
+    return expected
+
+
+def _parse(chunks):
+    lines = b"".join(chunks).decode().splitlines()
+    posts = [json.loads(line) for line in lines]
+    return {p["post_id"]: [(c["comment_id"], c["content"]) for c in p["comments"]] for p in posts}
+
+
+def test_iter_export_streams_comments(monkeypatch):
+    since, post_ids = _setup(monkeypatch)
+    with SessionLocal() as db:
+        chunks = list(export.iter_export(db, since))
+
+    assert _parse(chunks) == _expected(post_ids)
+    # 댓글도 청크 단위로 나뉘어 나옴 (한 번에 모아서 만들지 않음)
+    assert max(len(chunk) for chunk in chunks) < len(b"".join(chunks)) / 2
+
+
+@pytest.mark.anyio
+async def test_aiter_export_matches_sync(monkeypatch):
+    since, post_ids = _setup(monkeypatch)
+    async with AsyncSessionLocal() as db:
+        chunks = [chunk async for chunk in export.aiter_export(db, since)]
+
+    assert _parse(chunks) == _expected(post_ids)
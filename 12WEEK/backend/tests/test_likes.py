@@ -0,0 +1,70 @@
+# tests/test_likes.py
+# 좋아요 토글을 동시에 많이 보내도 posts.like_count 와 post_likes 행 수가 어긋나지 않는지 확인
+# 없는 게시글에 좋아요를 누르면 500(외래키 에러)이 아니라 404
+# 토글은 존재 확인용 SELECT 없이 INSERT/DELETE + UPDATE 두 문장
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import event, func, select
+
+from conftest import auth_header, make_post, make_user
+from controllers import toggle_like_controller
+from db import AsyncSessionLocal, SessionLocal, async_engine
+from models import Post, PostLike
+
+USERS = 30
+REQUESTS = 400
+
+
+@pytest.mark.anyio
+async def test_concurrent_like_toggles_keep_count_consistent(client):
+    author = make_user()
+    post_id = make_post(author)
+    headers = [auth_header(make_user()) for _ in range(USERS)]
+    rng = random.Random(3)
+
+    async def toggle(i: int):
+        return await client.post(
+            f"/posts/{post_id}/like",
+            json={"is_like": rng.random() < 0.6},
+            headers=headers[i % USERS],
+        )
+
+    responses = await asyncio.gather(*(toggle(i) for i in range(REQUESTS)))
+    assert {r.status_code for r in responses} == {200}
+
+    with SessionLocal() as db:
+        like_count = db.scalar(select(Post.like_count).where(Post.post_id == post_id))
+        rows = db.scalar(select(func.count()).select_from(PostLike).where(PostLike.post_id == post_id))
+    assert like_count == rows
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_like", [True, False])
+async def test_like_missing_post_returns_404(client, is_like):
+    response = await client.post(
+        "/posts/999999/like", json={"is_like": is_like}, headers=auth_header(make_user())
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "post_not_found"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_like", [True, False])
+async def test_like_toggle_runs_two_statements(is_like):
+    user_id = make_user()
+    post_id = make_post(user_id)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with AsyncSessionLocal() as db:
+            await toggle_like_controller(db, post_id, is_like, user_id)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert "SELECT" not in statements
+    assert len(statements) == 2
@@ -0,0 +1,19 @@
+# tests/test_loadtest.py
+# loadtest.percentile: nearest-rank (순위 = ceil(p/100 * n))
+import pytest
+
+from loadtest import percentile
+
+VALUES = [float(i) for i in range(1, 11)]
+
+
+@pytest.mark.parametrize(
+    "p, expected",
+    [(0, 1.0), (10, 1.0), (15, 2.0), (25, 3.0), (50, 5.0), (55, 6.0), (90, 9.0), (95, 10.0), (100, 10.0)],
+)
+def test_percentile_nearest_rank(p, expected):
+    assert percentile(VALUES, p) == expected
+
+
+def test_percentile_empty():
+    assert percentile([], 99) == 0.0
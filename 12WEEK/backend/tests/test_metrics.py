@@ -0,0 +1,14 @@
+# tests/test_metrics.py
+# MetricsRoute: 검증 실패(422)를 500 으로 기록하지 않는지
+import pytest
+
+
+@pytest.mark.anyio
+async def test_validation_error_recorded_as_422(client):
+    response = await client.get("/posts/search", params={"q": "사과", "limit": 1000})
+    assert response.status_code == 422
+
+    text = (await client.get("/metrics")).text
+    labels = 'method="GET",route="/posts/search",status="422"'
+    assert f"http_request_duration_seconds_count{{{labels}}} " in text
+    assert 'route="/posts/search",status="500"' not in text
@@ -0,0 +1,33 @@
+# tests/test_post_detail_queries.py
+# 게시글 상세 조회의 SQL 개수가 댓글 수와 상관없이 일정한지 확인 (N+1 방지)
+import pytest
+from sqlalchemy import event
+
+from conftest import make_post, make_user
+from controllers import post_detail_controller
+from db import AsyncSessionLocal, async_engine
+
+
+async def _count_statements(post_id: int) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        async with AsyncSessionLocal() as db:
+            await post_detail_controller(db, post_id)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+@pytest.mark.anyio
+async def test_post_detail_query_count_does_not_grow_with_comments():
+    author = make_user()
+    commenters = [make_user() for _ in range(5)]
+    small = make_post(author, comments=1, commenter_ids=commenters)
+    large = make_post(author, comments=300, commenter_ids=commenters)
+
+    assert await _count_statements(small) == await _count_statements(large)
@@ -0,0 +1,86 @@
+# tests/test_profiler.py
+# 요청 프로파일러: 관리자 + X-Debug-Profile 요청만 프로파일, .folded 저장, id 검사, 오래된 파일 정리
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import profiler
+from auth import create_access_token
+from profiler import ProfilerMiddleware, StackSampler, profile_path, save_profile
+
+ADMIN_ID = 9001
+USER_ID = 9002
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiler, "ADMIN_USER_IDS", {ADMIN_ID})
+    return tmp_path
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/posts")
+    async def posts():
+        return {"message": "list_posts_success"}
+
+    app.add_middleware(ProfilerMiddleware, sample_rate=0)
+    return app
+
+
+async def _get(headers: dict) -> httpx.Response:
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/posts", headers=headers)
+
+
+def _headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}", "X-Debug-Profile": "1"}
+
+
+@pytest.mark.anyio
+async def test_non_admin_header_is_ignored(profile_dir):
+    response = await _get(_headers(USER_ID))
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(profile_dir.iterdir()) == []
+
+    # 토큰 없이 헤더만 붙여도 무시
+    response = await _get({"X-Debug-Profile": "1"})
+    assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_admin_request_is_profiled(profile_dir):
+    response = await _get(_headers(ADMIN_ID))
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    path = profile_path(profile_id)
+    assert path is not None and path.parent == profile_dir
+    assert path.name.endswith(f"-{profile_id}-GET-posts.folded")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_profile_path_rejects_bad_ids(profile_dir):
+    (profile_dir / "20250101T000000-0123456789ab-GET-posts.folded").write_text("main 1\n")
+    assert profile_path("0123456789ab") is not None
+    for bad in ("../../etc/passwd", "*", "0123456789AB", "0123456789a", "0123456789abc", "0123456789ab/x"):
+        assert profile_path(bad) is None
+
+
+def test_old_profiles_are_pruned(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_KEEP", 3)
+    for i in range(4):
+        (profile_dir / f"2000010{i + 1}T000000-{i:012x}-GET-posts.folded").write_text("main 1\n")
+
+    name = save_profile(StackSampler(), "ffffffffffff", "GET", "/posts/1")
+
+    assert sorted(p.name for p in profile_dir.glob("*.folded")) == [
+        f"20000103T000000-{2:012x}-GET-posts.folded",
+        f"20000104T000000-{3:012x}-GET-posts.folded",
+        name,
+    ]
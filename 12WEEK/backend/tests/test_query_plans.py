@@ -0,0 +1,36 @@
+# tests/test_query_plans.py
+# 자주 쓰는 쿼리가 인덱스를 타는지 EXPLAIN QUERY PLAN 으로 확인
+# "SCAN posts" 처럼 USING INDEX 없이 테이블 전체를 읽는 단계가 있으면 실패
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from db import engine
+from models import Comment, Post
+
+HOT_QUERIES = {
+    # 게시글 상세 / 댓글 더보기 (_comment_page)
+    "comments_by_post": (
+        select(Comment)
+        .options(joinedload(Comment.user))
+        .where(Comment.post_id == 1)
+        .order_by(Comment.comment_id.asc())
+        .limit(20)
+    ),
+    # 유저별 게시글 / 댓글 (탈퇴, 프로필 등)
+    "posts_by_user": select(Post).where(Post.user_id == 1),
+    "comments_by_user": select(Comment).where(Comment.user_id == 1),
+}
+
+
+def _plan(query) -> list:
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(name):
+    plan = _plan(HOT_QUERIES[name])
+    full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+    assert not full_scans, f"{name}: {plan}"
@@ -0,0 +1,127 @@
+# tests/test_ratelimit.py
+# 토큰 버킷 rate limit: 429 + Retry-After, 시간이 지나면 회복, user_id / IP 별 버킷, 여러 워커의 sqlite 공유
+# (conftest 가 RATE_LIMIT_ENABLED=0 으로 끄므로 여기서만 켬)
+import types
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import ratelimit
+from auth import create_access_token
+from ratelimit import MemoryBackend, RateLimitMiddleware, RatePolicy, SQLiteBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "time", types.SimpleNamespace(monotonic=clock.monotonic, time=clock.time))
+    return clock
+
+
+def _app(backend=None, spec: str = "2/10"):
+    # 10초에 2번 → 5초마다 1번씩 회복
+    app = FastAPI()
+
+    @app.post("/users/login")
+    async def login():
+        return {"message": "login_success"}
+
+    @app.get("/posts")
+    async def posts():
+        return {"message": "list_posts_success"}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        policies={("POST", "/users/login"): RatePolicy("login", spec)},
+        backend=backend or MemoryBackend(),
+    )
+    return app
+
+
+async def _login(app, ip: str = "10.0.0.1", headers: dict = None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app, client=(ip, 1234))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/users/login", headers=headers)
+
+
+@pytest.mark.anyio
+async def test_429_with_retry_after_then_refill(clock):
+    app = _app()
+    assert (await _login(app)).status_code == 200
+    assert (await _login(app)).status_code == 200
+
+    response = await _login(app)
+    assert response.status_code == 429
+    assert response.json()["detail"] == "too_many_requests"
+    assert response.headers["Retry-After"] == "5"
+
+    clock.now += 2
+    response = await _login(app)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+    clock.now += 3
+    assert (await _login(app)).status_code == 200
+    assert (await _login(app)).status_code == 429
+
+
+@pytest.mark.anyio
+async def test_routes_without_policy_are_not_limited(clock):
+    app = _app(spec="1/10")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        statuses = {(await client.get("/posts")).status_code for _ in range(5)}
+    assert statuses == {200}
+
+
+@pytest.mark.anyio
+async def test_keyed_by_client_ip(clock):
+    app = _app(spec="1/10")
+    assert (await _login(app, ip="10.0.0.1")).status_code == 200
+    assert (await _login(app, ip="10.0.0.1")).status_code == 429
+    assert (await _login(app, ip="10.0.0.2")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_keyed_by_user_id_across_ips(clock):
+    app = _app(spec="1/10")
+    alice = {"Authorization": f"Bearer {create_access_token({'user_id': 101})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'user_id': 102})}"}
+
+    assert (await _login(app, ip="10.0.0.1", headers=alice)).status_code == 200
+    # 같은 유저는 IP 가 바뀌어도 같은 버킷
+    assert (await _login(app, ip="10.0.0.2", headers=alice)).status_code == 429
+    # 같은 IP 라도 다른 유저 / 비로그인은 각자 버킷
+    assert (await _login(app, ip="10.0.0.1", headers=bob)).status_code == 200
+    assert (await _login(app, ip="10.0.0.1")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_sqlite_backend_shared_between_workers(clock, tmp_path):
+    # 워커 두 개 = 같은 파일을 쓰는 SQLiteBackend 두 개
+    path = str(tmp_path / "ratelimit.db")
+    worker_a = _app(SQLiteBackend(path))
+    worker_b = _app(SQLiteBackend(path))
+
+    assert (await _login(worker_a)).status_code == 200
+    assert (await _login(worker_b)).status_code == 200
+    response = await _login(worker_a)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+
+    clock.now += 5
+    assert (await _login(worker_b)).status_code == 200
+    assert (await _login(worker_a)).status_code == 429
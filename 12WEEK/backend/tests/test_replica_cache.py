@@ -0,0 +1,51 @@
+# tests/test_replica_cache.py
+# 쓰기 직후에는 (반영 전일 수 있는) 레플리카 결과를 응답 캐시에 넣지 않는지 확인
+# 최근 쓰기 기록(_recent_writes)은 다시 읽지 않는 유저가 많아도 만료된 만큼 정리되는지
+import types
+from collections import OrderedDict
+
+import replicas
+from db import AsyncSessionLocal
+
+
+def _session(replica: bool):
+    db = AsyncSessionLocal()
+    db.info["replica"] = replica
+    return db
+
+
+def test_replica_read_not_cached_right_after_write(monkeypatch):
+    monkeypatch.setattr(replicas, "replica_sessions", [AsyncSessionLocal])
+    monkeypatch.setattr(replicas, "_last_write_at", float("-inf"))
+
+    assert replicas.cacheable_read(_session(replica=True))
+
+    replicas.mark_write(user_id=1)
+    assert not replicas.cacheable_read(_session(replica=True))
+    # primary 에서 읽은 결과는 최신이라 캐시해도 됨
+    assert replicas.cacheable_read(_session(replica=False))
+
+    monkeypatch.setattr(replicas, "READ_YOUR_WRITES_SECONDS", 0)
+    assert replicas.cacheable_read(_session(replica=True))
+
+
+def test_recent_writes_pruned_on_write(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(replicas, "replica_sessions", [AsyncSessionLocal])
+    monkeypatch.setattr(replicas, "_recent_writes", OrderedDict())
+    monkeypatch.setattr(replicas, "READ_YOUR_WRITES_SECONDS", 5)
+    monkeypatch.setattr(replicas, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+
+    for user_id in range(1000):
+        replicas.mark_write(user_id)
+        now[0] += 0.1
+    # 마지막 5초(50명) 안에 쓴 유저만 남음
+    assert len(replicas._recent_writes) <= 51
+    assert 999 in replicas._recent_writes and 0 not in replicas._recent_writes
+
+    # 다시 쓰면 맨 뒤로 옮겨져서 그 유저는 정리되지 않음
+    replicas.mark_write(960)
+    now[0] += 4.95
+    replicas.mark_write(2000)
+    assert list(replicas._recent_writes) == [960, 2000]
+    assert replicas._wrote_recently(960)
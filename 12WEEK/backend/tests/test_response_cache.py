@@ -0,0 +1,67 @@
+# tests/test_response_cache.py
+# 응답 캐시 무효화
+# - 읽는 도중에 태그가 무효화되면 그 읽기 결과(옛날 응답)는 캐시에 넣지 않음
+# - 회원 탈퇴 시 좋아요 / 댓글 수가 바뀐 다른 유저의 게시글 상세도 무효화
+import pytest
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from cache import ResponseCache, post_tag, response_cache, user_tag
+from conftest import auth_header, make_post, make_user
+from db import SessionLocal
+from models import Post, PostLike
+
+
+def test_set_skipped_when_tag_invalidated_during_read():
+    cache = ResponseCache(maxsize=10, ttl=60, enabled=True)
+
+    since = cache.version()
+    cache.invalidate(post_tag(1))  # 읽는 도중 커밋된 쓰기
+    cache.set("post_detail:1", b"stale", {post_tag(1), user_tag(7)}, since=since)
+    assert cache.get("post_detail:1") is None
+
+    # 다른 태그만 무효화됐으면 넣음
+    since = cache.version()
+    cache.invalidate(post_tag(2))
+    cache.set("post_detail:1", b"fresh", {post_tag(1), user_tag(7)}, since=since)
+    assert cache.get("post_detail:1") == b"fresh"
+
+
+def test_old_reads_skipped_after_invalidation_history_is_trimmed():
+    cache = ResponseCache(maxsize=2, ttl=60, enabled=True)
+    since = cache.version()
+    for post_id in range(5):
+        cache.invalidate(post_tag(post_id))
+
+    # post:0 기록은 버려졌지만 그보다 먼저 시작한 읽기라 안전하게 넣지 않음
+    cache.set("post_detail:0", b"stale", {post_tag(0)}, since=since)
+    assert cache.get("post_detail:0") is None
+
+    since = cache.version()
+    cache.set("post_detail:0", b"fresh", {post_tag(0)}, since=since)
+    assert cache.get("post_detail:0") == b"fresh"
+
+
+@pytest.mark.anyio
+async def test_delete_user_invalidates_touched_posts(client, monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", True)
+    author = make_user()
+    leaving = make_user()
+    liked = make_post(author)
+    commented = make_post(author, comments=2, commenter_ids=[leaving])
+    with SessionLocal() as db:
+        db.execute(sqlite_insert(PostLike).values(user_id=leaving, post_id=liked))
+        db.query(Post).filter(Post.post_id == liked).update({Post.like_count: 1})
+        db.commit()
+
+    for post_id in (liked, commented):
+        response_cache.set(f"post_detail:{post_id}", b"cached", {post_tag(post_id), user_tag(author)})
+
+    response = await client.delete("/users/me", headers=auth_header(leaving))
+    assert response.status_code == 200
+
+    assert response_cache.get(f"post_detail:{liked}") is None
+    assert response_cache.get(f"post_detail:{commented}") is None
+    detail = (await client.get(f"/posts/{liked}")).json()["data"]
+    assert detail["like_count"] == 0
+    detail = (await client.get(f"/posts/{commented}")).json()["data"]
+    assert detail["comment_count"] == 0
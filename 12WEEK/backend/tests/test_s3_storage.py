@@ -0,0 +1,145 @@
+# tests/test_s3_storage.py
+# S3Storage: 한 번에 올리기 / 멀티파트(파트 번호, complete) / 실패 시 abort / 같은 내용이면 다시 안 올림
+# boto3 대신 메모리에 저장하는 가짜 S3 클라이언트 사용
+import hashlib
+import io
+import sys
+import tempfile
+import threading
+import types
+
+import pytest
+from fastapi import UploadFile
+
+ClientError = pytest.importorskip("botocore.exceptions").ClientError
+
+from storage import S3Storage  # noqa: E402
+
+
+class FakeS3Client:
+    def __init__(self, fail_part: int = None):
+        self.fail_part = fail_part
+        self.objects = {}
+        self.uploads = {}     # upload_id -> {part_number: (etag, body)}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, name, **kwargs):
+        with self._lock:
+            self.calls.append((name, kwargs))
+
+    def names(self):
+        return [name for name, _ in self.calls]
+
+    def head_object(self, Bucket, Key):
+        self._record("head_object", Key=Key)
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body):
+        self._record("put_object", Key=Key)
+        self.objects[Key] = bytes(Body)
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self._record("create_multipart_upload", Key=Key, UploadId=upload_id)
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._record("upload_part", PartNumber=PartNumber, size=len(Body))
+        if PartNumber == self.fail_part:
+            raise ClientError({"Error": {"Code": "500"}}, "UploadPart")
+        etag = hashlib.md5(Body).hexdigest()
+        with self._lock:
+            self.uploads[UploadId][PartNumber] = (etag, bytes(Body))
+        return {"ETag": etag}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self._record("complete_multipart_upload", Key=Key, Parts=MultipartUpload["Parts"])
+        uploaded = self.uploads.pop(UploadId)
+        body = b""
+        for part in MultipartUpload["Parts"]:
+            etag, data = uploaded[part["PartNumber"]]
+            assert part["ETag"] == etag
+            body += data
+        self.objects[Key] = body
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._record("abort_multipart_upload", Key=Key, UploadId=UploadId)
+        self.uploads.pop(UploadId, None)
+
+
+def _storage(monkeypatch, client: FakeS3Client, part_size: int = 1024) -> S3Storage:
+    monkeypatch.setitem(sys.modules, "boto3", types.SimpleNamespace(client=lambda *args, **kwargs: client))
+    return S3Storage("bucket", public_url="https://cdn.example.com/bucket", part_size=part_size, max_concurrency=2)
+
+
+def _upload(data: bytes, filename: str = "photo.png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+@pytest.mark.anyio
+async def test_small_file_single_put_and_dedupe(monkeypatch):
+    client = FakeS3Client()
+    storage = _storage(monkeypatch, client)
+    data = b"small image"
+
+    key = await storage.save(_upload(data), "post_images")
+    assert key == f"post_images/{hashlib.sha256(data).hexdigest()}.png"
+    assert storage.url(key) == f"https://cdn.example.com/bucket/{key}"
+    assert client.objects[key] == data
+    assert client.names() == ["head_object", "put_object"]
+
+    # 같은 내용을 다시 올리면 head_object 만 하고 업로드하지 않음
+    client.calls.clear()
+    assert await storage.save(_upload(data, "again.png"), "post_images") == key
+    assert client.names() == ["head_object"]
+
+
+@pytest.mark.anyio
+async def test_large_file_multipart_upload(monkeypatch):
+    client = FakeS3Client()
+    storage = _storage(monkeypatch, client, part_size=10)
+    data = bytes(range(47))
+
+    key = await storage.save(_upload(data), "post_images")
+
+    assert client.objects[key] == data
+    assert "put_object" not in client.names()
+    part_sizes = sorted((kw["PartNumber"], kw["size"]) for name, kw in client.calls if name == "upload_part")
+    assert part_sizes == [(1, 10), (2, 10), (3, 10), (4, 10), (5, 7)]
+    (complete,) = [kw for name, kw in client.calls if name == "complete_multipart_upload"]
+    assert [part["PartNumber"] for part in complete["Parts"]] == [1, 2, 3, 4, 5]
+    assert "abort_multipart_upload" not in client.names()
+
+
+@pytest.mark.anyio
+async def test_failed_part_aborts_upload(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))  # 임시 파일(spool)이 지워지는지 확인용
+    client = FakeS3Client(fail_part=3)
+    storage = _storage(monkeypatch, client, part_size=10)
+
+    with pytest.raises(ClientError):
+        await storage.save(_upload(b"x" * 47), "post_images")
+
+    assert client.objects == {}
+    assert "complete_multipart_upload" not in client.names()
+    (abort,) = [kw for name, kw in client.calls if name == "abort_multipart_upload"]
+    assert abort["UploadId"] == "upload-1"
+    assert client.uploads == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_read_write_bytes(monkeypatch):
+    client = FakeS3Client()
+    storage = _storage(monkeypatch, client)
+
+    assert not storage.exists("variants/a_160.webp")
+    storage.write_bytes("variants/a_160.webp", b"webp")
+    assert storage.exists("variants/a_160.webp")
+    assert storage.read_bytes("variants/a_160.webp") == b"webp"
@@ -0,0 +1,25 @@
+# tests/test_search.py
+# 게시글 검색 limit 범위 검증 (0 이면 IndexError, 음수면 LIMIT 없이 전체 조회가 되던 문제)
+import pytest
+
+from conftest import make_post, make_user
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [0, -1, 101])
+async def test_search_rejects_out_of_range_limit(client, limit):
+    response = await client.get("/posts/search", params={"q": "title", "limit": limit})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_search_limit_pages_results(client):
+    author = make_user()
+    for _ in range(3):
+        make_post(author)
+
+    response = await client.get("/posts/search", params={"q": "title", "limit": 1})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert len(data["posts"]) == 1
+    assert data["next_cursor"]
@@ -0,0 +1,85 @@
+# tests/test_slowlog.py
+# 느린 쿼리 로그: fingerprint 정규화, 파라미터 가리기, 임계값을 넘으면 EXPLAIN QUERY PLAN 저장, 관리자 API
+import types
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import auth
+from conftest import auth_header, make_user
+from slowlog import SlowQueryLog, fingerprint, redact_params
+
+
+def test_fingerprint_replaces_literals():
+    assert (
+        fingerprint("SELECT * FROM posts WHERE post_id = 42 AND title = 'it''s'  AND score > 1.5")
+        == "SELECT * FROM posts WHERE post_id = ? AND title = ? AND score > ?"
+    )
+
+
+def test_fingerprint_collapses_in_lists():
+    short = fingerprint("SELECT * FROM users WHERE user_id IN (?, ?)")
+    long = fingerprint("SELECT * FROM users WHERE user_id IN (1, 2, 3, 4, 5)")
+    assert short == long == "SELECT * FROM users WHERE user_id IN (...)"
+
+
+def test_fingerprint_collapses_multi_row_values():
+    two = fingerprint("INSERT INTO comments (post_id, content) VALUES (?, ?), (?, ?)")
+    many = fingerprint("INSERT INTO comments (post_id, content) VALUES (1, 'a'), (1, 'b'), (2, 'c')")
+    assert two == many == "INSERT INTO comments (post_id, content) VALUES (?, ?), ..."
+    # 한 줄짜리는 그대로
+    assert fingerprint("INSERT INTO t (a) VALUES (?)") == "INSERT INTO t (a) VALUES (?)"
+
+
+def test_redact_named_params():
+    context = types.SimpleNamespace(
+        compiled_parameters=[{"email_1": "a@b.c", "password": "pw", "user_id_1": 3, "content": "x" * 100}]
+    )
+    params = redact_params(context, ("a@b.c", "pw", 3, "x" * 100))
+    assert params["email_1"] == "***"
+    assert params["password"] == "***"
+    assert params["user_id_1"] == 3
+    assert params["content"].startswith("x" * 80) and params["content"].endswith("(100 chars)")
+
+
+def test_redact_raw_sql_masks_everything():
+    assert redact_params(None, ("a@b.c", 3)) == ["***", "***"]
+    assert redact_params(None, [("a", 1), ("b", 2)]) == "<executemany x2>"
+
+
+def test_slow_query_captures_plan(tmp_path, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    log = SlowQueryLog(threshold_ms=0, keep=10)  # 모든 쿼리가 느린 쿼리
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (user_id INTEGER PRIMARY KEY, email TEXT)"))
+        conn.execute(text("CREATE INDEX ix_users_email ON users (email)"))
+    log.attach(engine)
+
+    with engine.connect() as conn:
+        for email in ("a@test.com", "b@test.com"):
+            conn.execute(text("SELECT user_id FROM users WHERE email = :email"), {"email": email})
+
+    entries = [e for e in log.recent if e["fingerprint"].startswith("SELECT user_id")]
+    assert len(entries) == 2
+    assert entries[0]["params"] == {"email": "***"}
+    assert any("ix_users_email" in line for line in entries[0]["plan"])
+    (top,) = [row for row in log.top() if row["fingerprint"].startswith("SELECT user_id")]
+    assert top["count"] == 2 and top["slow_count"] == 2
+    assert "[SLOW QUERY]" in capsys.readouterr().out
+    engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_admin_slow_queries_requires_admin(client, monkeypatch):
+    admin = make_user()
+    user = make_user()
+    monkeypatch.setattr(auth, "ADMIN_USER_IDS", {admin})
+
+    assert (await client.get("/admin/slow-queries")).status_code == 401
+    assert (await client.get("/admin/slow-queries", headers=auth_header(user))).status_code == 403
+
+    response = await client.get("/admin/slow-queries", params={"limit": 5}, headers=auth_header(admin))
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert set(data) == {"threshold_ms", "top", "recent"}
+    assert len(data["top"]) <= 5
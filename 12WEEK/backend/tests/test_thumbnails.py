@@ -0,0 +1,65 @@
+# tests/test_thumbnails.py
+# 작은 버전 생성: URL 이 아니라 저장소 키로 원본을 읽으므로 S3 처럼 절대 URL 을 쓰는 저장소에서도 동작하는지
+import io
+
+from PIL import Image
+from sqlalchemy import select
+
+import thumbnails
+from db import SessionLocal
+from models import ImageVariant
+
+
+class MemoryStorage:
+    # S3Storage 와 같은 인터페이스 (url 이 절대 URL)
+    def __init__(self):
+        self.objects = {}
+
+    def url(self, key: str) -> str:
+        return f"https://cdn.example.com/bucket/{key}"
+
+    def exists(self, key: str) -> bool:
+        return key in self.objects
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.objects[key]
+
+    def write_bytes(self, key: str, data: bytes):
+        self.objects[key] = data
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "orange").save(out, "JPEG")
+    return out.getvalue()
+
+
+def test_generates_variants_from_storage_key(monkeypatch):
+    storage = MemoryStorage()
+    storage.objects["post_images/abc.jpg"] = _jpeg(600, 300)
+    monkeypatch.setattr(thumbnails, "storage", storage)
+
+    thumbnails.generate_variants("post_images/abc.jpg")
+
+    source = storage.url("post_images/abc.jpg")
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(ImageVariant.width, ImageVariant.url)
+            .where(ImageVariant.source == source)
+            .order_by(ImageVariant.width)
+        ).all()
+    # 원본(600px)보다 큰 1080 은 만들지 않음
+    assert [width for width, _ in rows] == [160, 480]
+    for width, url in rows:
+        key = url.removeprefix("https://cdn.example.com/bucket/")
+        assert key.startswith("variants/post_images_abc_")
+        with Image.open(io.BytesIO(storage.objects[key])) as variant:
+            assert variant.width == width
+
+
+def test_missing_source_is_skipped(monkeypatch):
+    monkeypatch.setattr(thumbnails, "storage", MemoryStorage())
+    thumbnails.generate_variants("post_images/missing.jpg")
+
+    with SessionLocal() as db:
+        assert db.scalar(select(ImageVariant).where(ImageVariant.source.like("%missing.jpg"))) is None
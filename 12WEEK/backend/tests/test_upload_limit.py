@@ -0,0 +1,58 @@
+# tests/test_upload_limit.py
+# 업로드 크기 제한 미들웨어: 본문을 다 받기 전에 413 으로 거절하는지
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from storage import UploadSizeLimitMiddleware
+
+MAX_BYTES = 1000
+
+
+def _app():
+    app = FastAPI()
+    app.state.bodies = []
+
+    @app.post("/upload/image")
+    async def upload(request: Request):
+        body = await request.body()
+        app.state.bodies.append(len(body))
+        return {"size": len(body)}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_BYTES)
+    return app
+
+
+async def _post(app, content):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/upload/image", content=content)
+
+
+@pytest.mark.anyio
+async def test_rejects_large_content_length_without_reading_body():
+    app = _app()
+    response = await _post(app, b"x" * (MAX_BYTES + 1))
+    assert response.status_code == 413
+    assert response.json()["detail"] == "file_too_large"
+    assert app.state.bodies == []
+
+
+@pytest.mark.anyio
+async def test_rejects_chunked_body_once_limit_is_exceeded():
+    async def chunks():
+        for _ in range(10):
+            yield b"x" * 300
+
+    app = _app()
+    response = await _post(app, chunks())
+    assert response.status_code == 413
+    assert app.state.bodies == []
+
+
+@pytest.mark.anyio
+async def test_small_upload_passes():
+    app = _app()
+    response = await _post(app, b"x" * MAX_BYTES)
+    assert response.status_code == 200
+    assert response.json() == {"size": MAX_BYTES}
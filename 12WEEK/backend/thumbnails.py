@@ -0,0 +1,119 @@
+# thumbnails.py
+# 게시글/프로필 이미지의 작은 버전(160/480/1080px)을 백그라운드에서 생성
+# - 업로드 직후 schedule_variants(저장소 키) 로 작업을 넘기고 응답은 바로 반환
+# - 전용 워커 풀에서 저장소(storage.py)의 원본을 읽어 리사이즈 → 같은 저장소의 variants/ 에 저장
+#   → image_variants 테이블에 기록 (로컬이면 media/variants/, S3 면 버킷의 variants/)
+# - 목록 API 는 작은 버전이 있으면 그 URL, 아직 없으면 원본 URL 을 내려줌
+#
+# 기존 이미지 일괄 생성 (로컬 저장소): python thumbnails.py
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Optional
+
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import SessionLocal
+from models import ImageVariant
+from storage import storage
+
+BASE_DIR = Path(__file__).resolve().parent
+MEDIA_DIR = BASE_DIR / "media"
+
+VARIANT_WIDTHS = (160, 480, 1080)
+THUMBNAIL_WIDTH = 160               # 목록에서 쓰는 크기
+VARIANT_FORMAT = os.getenv("VARIANT_FORMAT", "WEBP")  # WEBP 또는 JPEG
+VARIANT_QUALITY = 80
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+
+_EXT = {"WEBP": ".webp", "JPEG": ".jpg"}
+_pool = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+
+
+def generate_variants(key: str, source: Optional[str] = None):
+    # key: 저장소 키 ("post_images/<sha256>.jpg")
+    # source: DB 에 저장된 원본 값 (posts.image / users.profile_image), 기본은 storage.url(key)
+    source = source or storage.url(key)
+    if not storage.exists(key):
+        return
+
+    ext = _EXT[VARIANT_FORMAT]
+    # 원본 파일명이 이미 내용 해시라서 variant 파일명도 그대로 재사용 가능
+    path = PurePosixPath(key)
+    stem = f"{path.parent.name}_{path.stem}"
+
+    rows = []
+    with Image.open(io.BytesIO(storage.read_bytes(key))) as original:
+        original = original.convert("RGB")
+        for width in VARIANT_WIDTHS:
+            if width >= original.width:
+                # 원본보다 크게 늘리지는 않음
+                continue
+            variant_key = f"variants/{stem}_{width}{ext}"
+            if not storage.exists(variant_key):
+                height = round(original.height * width / original.width)
+                resized = original.resize((width, height), Image.LANCZOS)
+                out = io.BytesIO()
+                resized.save(out, VARIANT_FORMAT, quality=VARIANT_QUALITY)
+                storage.write_bytes(variant_key, out.getvalue())
+            rows.append({"source": source, "width": width, "url": storage.url(variant_key)})
+
+    if not rows:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(
+            sqlite_insert(ImageVariant)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["source", "width"])
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run(key: str):
+    try:
+        generate_variants(key)
+    except Exception as e:
+        print("[WARN] 썸네일 생성 실패:", key, e)
+
+
+def schedule_variants(key: Optional[str]):
+    if key:
+        _pool.submit(_run, key)
+
+
+def shutdown():
+    _pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def thumbnail_urls(db: AsyncSession, sources: Iterable[str], width: int = THUMBNAIL_WIDTH) -> Dict[str, str]:
+    # 원본 경로 → 작은 버전 URL (없는 건 빠짐) 을 쿼리 한 번으로
+    sources = {s for s in sources if s}
+    if not sources:
+        return {}
+    rows = await db.execute(
+        select(ImageVariant.source, ImageVariant.url)
+        .where(ImageVariant.source.in_(sources), ImageVariant.width == width)
+    )
+    return {source: url for source, url in rows}
+
+
+if __name__ == "__main__":
+    from migrations import run_migrations
+
+    run_migrations()
+    count = 0
+    for folder in ("post_images", "profile"):
+        for path in sorted((MEDIA_DIR / folder).glob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                # DB 에 저장되는 형태와 맞춤 (게시글: /media/..., 프로필: media/...)
+                source = f"/media/{folder}/{path.name}" if folder == "post_images" else f"media/{folder}/{path.name}"
+                generate_variants(f"{folder}/{path.name}", source)
+                count += 1
+    print(f"{count}개 이미지 처리 완료")
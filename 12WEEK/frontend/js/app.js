@@ -47,6 +47,13 @@ function navigate(path) {
 // 공통 API 래퍼
 // =============================
 const API_BASE = "http://localhost:8000"; // FastAPI 주소
+
+// 이미지 경로 → src 로 쓸 URL
+// S3 같은 외부 저장소면 절대 URL 그대로, 로컬 저장소면 "/media/..." (예전 데이터는 "media/...")
+function mediaUrl(path) {
+  if (/^https?:\/\//.test(path)) return path;
+  return `${API_BASE}/${path.replace(/^\//, "")}`;
+}
 async function apiRequest(url, method = "GET", body = null, isFile = false) {
   const headers = {};
   const token = localStorage.getItem("access_token");
@@ -192,7 +199,7 @@ function renderHeader() {
   const toggleModeClass = isBoardPage ? "toggle-light" : "toggle-dark";
   let avatarHtml = "";
   if (user && user.profile_image) {
-    const imgUrl = `${API_BASE}/${user.profile_image}`;
+    const imgUrl = mediaUrl(user.profile_image);
     avatarHtml = `<img src="${imgUrl}" class="profile-avatar-img" alt="프로필" />`;
   } else {
     avatarHtml = `<div class="profile-avatar-fallback">🙂</div>`;
@@ -165,9 +165,10 @@ async function renderPostDetail() {
     const isWriter = user && user.user_id === data.user_id;
     const authorName = data.user_nickname || `#${data.user_id}`;
     const likeCount = data.like_count || 0;
-    const commentsHtml = (data.comments || [])
-      .map(
-        (c) => `
+    const renderComments = (comments) =>
+      (comments || [])
+        .map(
+          (c) => `
         <div class="comment" data-cid="${c.comment_id}">
           <div class="comment-top">
             <span class="comment-author">${c.user_nickname}</span>
@@ -180,8 +181,10 @@ async function renderPostDetail() {
           <div class="comment-content">${escapeHtml(c.content)}</div>
         </div>
       `
-      )
-      .join("");
+        )
+        .join("");
+    const commentsHtml = renderComments(data.comments);
+    let commentCursor = data.comments_next_cursor;
 
     document.getElementById("postDetailContainer").innerHTML = `
     <div class="post-detail-header-row">
@@ -202,7 +205,7 @@ async function renderPostDetail() {
   </div>
 
   ${data.image
-     ? `<img src="${API_BASE}${escapeHtml(data.image)}" class="post-detail-image" />`
+     ? `<img src="${escapeHtml(mediaUrl(data.image))}" class="post-detail-image" />`
       : ""
   }
 
@@ -220,10 +223,15 @@ async function renderPostDetail() {
   <hr />
 
   <section class="comment-section">
-    <h3>댓글</h3>
+    <h3>댓글 ${data.comment_count || 0}</h3>
     <div id="commentList">
       ${commentsHtml || "<p>아직 댓글이 없습니다.</p>"}
     </div>
+    ${
+      data.comments_has_next
+        ? `<button class="text-btn" id="btnMoreComments">댓글 더보기</button>`
+        : ""
+    }
 
     <div class="comment-form">
       <textarea
@@ -316,26 +324,44 @@ async function renderPostDetail() {
       } catch (e) {}
     });
 
-    // 댓글 수정
-    document.querySelectorAll(".edit-comment").forEach((btn) => {
-      btn.addEventListener("click", async (e) => {
-        const commentEl = e.target.closest(".comment");
-        const cid = commentEl.getAttribute("data-cid");
-        const oldContent = commentEl.querySelector(".comment-content").innerText;
-
-        const newContent = prompt("댓글 수정", oldContent);
-        if (!newContent || newContent.trim() === "") return;
-
+    // 댓글 더보기 (커서 기반으로 다음 페이지 이어 붙이기)
+    const btnMore = document.getElementById("btnMoreComments");
+    if (btnMore) {
+      btnMore.addEventListener("click", async () => {
         try {
-          await apiRequest(
-            `/posts/${id}/comments/${cid}`,
-            "PATCH",
-            { content: newContent.trim() }
+          const more = await apiRequest(
+            `/posts/${id}/comments?cursor=${commentCursor}`,
+            "GET"
           );
-          alert("댓글이 수정되었습니다.");
-          renderPostDetail();
+          const page = more.data || more;
+          document
+            .getElementById("commentList")
+            .insertAdjacentHTML("beforeend", renderComments(page.comments));
+          commentCursor = page.next_cursor;
+          if (!page.has_next) btnMore.remove();
         } catch (e) {}
       });
+    }
+
+    // 댓글 수정 (더보기로 추가된 댓글도 처리되도록 목록에 위임)
+    document.getElementById("commentList").addEventListener("click", async (e) => {
+      if (!e.target.classList.contains("edit-comment")) return;
+      const commentEl = e.target.closest(".comment");
+      const cid = commentEl.getAttribute("data-cid");
+      const oldContent = commentEl.querySelector(".comment-content").innerText;
+
+      const newContent = prompt("댓글 수정", oldContent);
+      if (!newContent || newContent.trim() === "") return;
+
+      try {
+        await apiRequest(
+          `/posts/${id}/comments/${cid}`,
+          "PATCH",
+          { content: newContent.trim() }
+        );
+        alert("댓글이 수정되었습니다.");
+        renderPostDetail();
+      } catch (e) {}
     });
   } catch (e) {
     console.error("[renderPostDetail] ERROR:", e);
@@ -506,8 +532,8 @@ async function renderPostEdit() {
         <div class="image-preview-wrapper" style="margin-top:8px;">
           ${
             data.image
-              ? `<img src="${API_BASE}${escapeHtml(
-                  data.image
+              ? `<img src="${escapeHtml(
+                  mediaUrl(data.image)
                 )}" id="editImagePreview" class="image-preview" />`
               : `<img id="editImagePreview" class="image-preview" style="display:none;" />`
           }
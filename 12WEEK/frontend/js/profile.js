@@ -34,7 +34,7 @@ async function renderProfileEdit() {
       <div class="profile-avatar-big">
         ${
           data.profile_image
-            ? `<img src="${API_BASE}/${data.profile_image}" class="profile-avatar-big-img" alt="프로필" />`
+            ? `<img src="${mediaUrl(data.profile_image)}" class="profile-avatar-big-img" alt="프로필" />`
             : "🙂"
         }
       </div>
@@ -64,7 +64,7 @@ async function renderProfileEdit() {
           <img 
             id="editProfilePreview" 
             class="profile-edit-preview"
-            src="${data.profile_image ? `${API_BASE}/${data.profile_image}` : ""}" 
+            src="${data.profile_image ? mediaUrl(data.profile_image) : ""}" 
             alt="미리보기" 
           />
         </div>